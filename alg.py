@@ -6,171 +6,534 @@ Objetivo: mantém a mesma forma usada antes:
   max p * sum(v) - transporte - custo fixo prensas - custo operacional (o * t * visita)
 """
 
+import os
+import time
+import hashlib
+import argparse
+from datetime import datetime
 import numpy as np
 import json
 from gurobipy import Model, GRB
 
+import ingestao
+
 # -------- CONFIG ----------
 USE_ALL_PRESSES = True   # força uso de todas as prensas
 TIME_LIMIT = 600          # segundos, 0 para sem limite
+MIP_GAP = 1e-3            # gap de otimalidade relativo
 WRITE_IIS = True          # se infeasible, exportará IIS (gurobi .ilp)
+USE_TUNED_PARAMS = True   # aplica parâmetros ajustados por tuning.py (se existirem)
+PREPROCESS = True         # reduz o modelo (preprocessamento.py) antes de resolver
+CHECKPOINT = True         # grava cada incumbente em CHECKPOINT_FILE (retomar com --resume)
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_INTERVAL = 5.0  # segundos entre atualizações do tempo_total do checkpoint sem novo incumbente
+USE_TRAVEL_TIME = False   # soma o * tempo de viagem (TD_jk / travel_time_ij) ao custo de cada arco
+TUNED_PARAMS_FILE = "tuned_params.json"
+MIN_RESUME_TIME_LIMIT = 10  # segundos mínimos para uma retomada cujo TIME_LIMIT já se esgotou
 # --------------------------
 
 # parâmetros econômicos / problema
 p = 120.0  # preço por tonelada
 deposito = 0
 
-# -------- load data (.npy gerados por seu script) ----------
-print("Carregando dados .npy...")
-c = np.load("data/c_ijk.npy")        # (m,n,n)
-t = np.load("data/t_ij.npy")         # (m,n) minutos (processamento)
-S = np.load("data/S.npy")            # (n,)
-f = np.load("data/f.npy")            # (m,)
-o = np.load("data/o.npy")            # (m,)
-# capacidade por prensa (opcional)
-try:
-    cap_prensa = np.load("data/capacidade_i.npy")
-except:
-    cap_prensa = None
-
-m, n = t.shape
-print(f"m={m}, n={n}")
-print("Dados carregados.\n")
-
-# --------- modelo ----------
-model = Model("VRP_1viagem_por_prensa")
-
-# variáveis
-x = model.addVars(m, n, n, vtype=GRB.BINARY, name="x")   # arco i,j->k
-u = model.addVars(m, n, vtype=GRB.BINARY, name="u")     # prensa i visita j
-w = model.addVars(m, n, vtype=GRB.BINARY, name="w")     # prensa i processa j (total)
-vvol = model.addVars(n, lb=0.0, ub=S.tolist(), vtype=GRB.CONTINUOUS, name="v")  # volume processado
-z = model.addVars(m, vtype=GRB.BINARY, name="z")        # prensa ligada
-eta = model.addVars(m, n, lb=0.0, ub=n, vtype=GRB.CONTINUOUS, name="eta")  # MTZ
-
-# Função Objetivo
-term_receita = sum(p * vvol[j] for j in range(n))
-term_transporte = sum(c[i, j, k] * x[i, j, k] for i in range(m) for j in range(n) for k in range(n))
-term_fixo = sum(f[i] * z[i] for i in range(m))
-term_operacional = sum(o[i] * t[i, j] * u[i, j] for i in range(m) for j in range(n))
-
-model.setObjective(term_receita - term_transporte - term_fixo - term_operacional, GRB.MAXIMIZE)
-
-# -------- Restrições --------
-
-# 0) Uma prensa não pode visitar a mesma cidade mais de uma vez
-for i in range(m):
+
+def carregar_dados(pasta="data"):
+    """
+    Carrega os arrays .npy gerados por files.py
+    """
+    c = np.load(os.path.join(pasta, "c_ijk.npy"))        # (m,n,n)
+    t = np.load(os.path.join(pasta, "t_ij.npy"))         # (m,n) minutos (processamento)
+    S = np.load(os.path.join(pasta, "S.npy"))            # (n,)
+    f = np.load(os.path.join(pasta, "f.npy"))            # (m,)
+    o = np.load(os.path.join(pasta, "o.npy"))            # (m,)
+    # capacidade por prensa (opcional)
+    try:
+        cap_prensa = np.load(os.path.join(pasta, "capacidade_i.npy"))
+    except:
+        cap_prensa = None
+    dados = {"c": c, "t": t, "S": S, "f": f, "o": o, "capacidade": cap_prensa}
+    # matrizes CSV (tempo de viagem, viabilidade, soluções) - cache binário em data/.cache
+    m, n = t.shape
+    dados.update(ingestao.carregar_extras(pasta, m, n))
+    return dados
+
+
+def aplicar_tempo_viagem(dados):
+    """
+    Soma o[i] * tempo de viagem do arco ao custo de transporte c[i,j,k]
+    """
+    tempo = ingestao.tempo_viagem(dados, deposito)
+    if tempo is None:
+        return dados
+    return dict(dados, c=dados["c"] + dados["o"][:, None, None] * tempo)
+
+
+def hash_instancia(dados):
+    """
+    Hash do conteúdo da instância (independe de vir de .npy ou de listas JSON) e da
+    configuração que muda o modelo ou o objetivo; com USE_TRAVEL_TIME entram também
+    as matrizes de tempo de viagem que o solver soma a c.
+    """
+    h = hashlib.sha256()
+    config = {"USE_ALL_PRESSES": USE_ALL_PRESSES, "p": p, "deposito": deposito, "USE_TRAVEL_TIME": USE_TRAVEL_TIME}
+    h.update(json.dumps(config, sort_keys=True).encode())
+    chaves = ["c", "t", "S", "f", "o", "viavel"]
+    if USE_TRAVEL_TIME:
+        chaves += ["TD_jk", "travel_time_ij"]
+    for chave in chaves:
+        if dados.get(chave) is None:
+            continue
+        arr = np.ascontiguousarray(dados[chave], dtype=np.float64)
+        h.update(chave.encode())
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def construir_modelo(dados, env=None, reducao=None):
+    """
+    Constrói o modelo Gurobi e retorna (model, variáveis)
+    """
+    if reducao is not None:
+        return construir_modelo_reduzido(dados, reducao, env=env)
+
+    c, t, S, f, o = dados["c"], dados["t"], dados["S"], dados["f"], dados["o"]
+    m, n = t.shape
+
+    model = Model("VRP_1viagem_por_prensa", env=env)
+
+    # variáveis
+    x = model.addVars(m, n, n, vtype=GRB.BINARY, name="x")   # arco i,j->k
+    u = model.addVars(m, n, vtype=GRB.BINARY, name="u")     # prensa i visita j
+    w = model.addVars(m, n, vtype=GRB.BINARY, name="w")     # prensa i processa j (total)
+    vvol = model.addVars(n, lb=0.0, ub=S.tolist(), vtype=GRB.CONTINUOUS, name="v")  # volume processado
+    z = model.addVars(m, vtype=GRB.BINARY, name="z")        # prensa ligada
+    eta = model.addVars(m, n, lb=0.0, ub=n, vtype=GRB.CONTINUOUS, name="eta")  # MTZ
+
+    # pares (prensa, cidade) inviáveis segundo feasible_ij.csv
+    viavel = dados.get("viavel")
+    if viavel is not None:
+        for i, j in zip(*np.nonzero(~viavel)):
+            if j != deposito:
+                u[int(i), int(j)].UB = 0
+
+    # Função Objetivo
+    term_receita = sum(p * vvol[j] for j in range(n))
+    term_transporte = sum(c[i, j, k] * x[i, j, k] for i in range(m) for j in range(n) for k in range(n))
+    term_fixo = sum(f[i] * z[i] for i in range(m))
+    term_operacional = sum(o[i] * t[i, j] * u[i, j] for i in range(m) for j in range(n))
+
+    model.setObjective(term_receita - term_transporte - term_fixo - term_operacional, GRB.MAXIMIZE)
+
+    # -------- Restrições --------
+
+    # 0) Uma prensa não pode visitar a mesma cidade mais de uma vez
+    for i in range(m):
+        for j in range(n):
+            model.addConstr(x[i, j, j] == 0)
+
+    # 1) Cada cidade só pode receber uma prensa
     for j in range(n):
-        model.addConstr(x[i, j, j] == 0)
+        if j == deposito:
+            # não força atribuição de depósito entre i
+            continue
+        model.addConstr(sum(u[i, j] for i in range(m)) == 1, name=f"atribuicao_cidade_{j}")
 
-# 1) Cada cidade só pode receber uma prensa
-for j in range(n):
-    if j == deposito:
-        # não força atribuição de depósito entre i
-        continue
-    model.addConstr(sum(u[i, j] for i in range(m)) == 1, name=f"atribuicao_cidade_{j}")
+    # 2) Toda prensa que entrar em uma cidade precisa sair da cidade
+    for i in range(m):
+        for j in range(n):
+            if j == deposito:
+                continue
+            model.addConstr(sum(x[i, k, j] for k in range(n)) == u[i, j], name=f"fluxo_entrada_u_{i}_{j}")
+            model.addConstr(sum(x[i, j, k] for k in range(n)) == u[i, j], name=f"fluxo_saida_u_{i}_{j}")
 
+    # 3) Se prensa foi ativada, ela precisa sair uma vez do deposito e voltar uma única vez
+    for i in range(m):
+        model.addConstr(sum(x[i, deposito, k] for k in range(n)) == z[i], name=f"saida_deposito_{i}")
+        model.addConstr(sum(x[i, k, deposito] for k in range(n)) == z[i], name=f"entrada_deposito_{i}")
 
+    # 4) Se um arco foi criado, as cidades envolvidas foram visitadas
+    for i in range(m):
+        for j in range(n):
+            for k in range(n):
+                model.addConstr(x[i, j, k] <= u[i, j])
+                model.addConstr(x[i, j, k] <= u[i, k])
+
+    # 5) Só pode processar sucata se a cidade for visitada
+    for i in range(m):
+        for j in range(n):
+            model.addConstr(w[i, j] <= u[i, j])
 
-# 2) Toda prensa que entrar em uma cidade precisa sair da cidade
-for i in range(m):
+    # 6) cada cidade processada exatamente uma vez (processamento completo)
     for j in range(n):
         if j == deposito:
-            continue
-        model.addConstr(sum(x[i, k, j] for k in range(n)) == u[i, j], name=f"fluxo_entrada_u_{i}_{j}")
-        model.addConstr(sum(x[i, j, k] for k in range(n)) == u[i, j], name=f"fluxo_saida_u_{i}_{j}")
-
-# 3) Se prensa foi ativada, ela precisa sair uma vez do deposito e voltar uma única vez
-for i in range(m):
-    model.addConstr(sum(x[i, deposito, k] for k in range(n)) == z[i], name=f"saida_deposito_{i}")
-    model.addConstr(sum(x[i, k, deposito] for k in range(n)) == z[i], name=f"entrada_deposito_{i}")
+            model.addConstr(sum(w[i, j] for i in range(m)) == 0)
+        else:
+            model.addConstr(sum(w[i, j] for i in range(m)) == 1, name=f"processa_uma_vez_{j}")
 
-# 4) Se um arco foi criado, as cidades envolvidas foram visitadas
-for i in range(m):
+    # 7) O volume processado não pode ultrapassar o volume total da cidade (o deposito não possui sucata para ser processada)
     for j in range(n):
-        for k in range(n):
-            model.addConstr(x[i, j, k] <= u[i, j])
-            model.addConstr(x[i, j, k] <= u[i, k])
+        if j == deposito:
+            model.addConstr(vvol[j] == 0)
+        else:
+            model.addConstr(vvol[j] == S[j] * sum(w[i, j] for i in range(m)), name=f"liga_volume_{j}")
+
+    # 8) z ligado a visitas: se alguma visita por i então z[i]=1
+    for i in range(m):
+        model.addConstr(sum(u[i, j] for j in range(n)) <= n * z[i])
+
+    # 9) MTZ eliminação de sub-tours (nós 1..n-1)
+    for i in range(m):
+        for j in range(1, n):
+            for k in range(1, n):
+                if j == k:
+                    continue
+                model.addConstr(eta[i, j] - eta[i, k] + n * x[i, j, k] <= n - 1)
+
+    # 10) força todas as prensas usadas
+    if USE_ALL_PRESSES:
+        for i in range(m):
+            model.addConstr(z[i] == 1)
+
+    return model, {"x": x, "u": u, "w": w, "v": vvol, "z": z, "eta": eta}
+
+
+def construir_modelo_reduzido(dados, reducao, env=None):
+    """
+    Mesmo modelo sobre os pares/arcos que restaram do pré-processamento.
+    u[i,0] é substituída por z[i]; w e v são eliminadas (w = u, v = S) e a receita vira constante.
+    """
+    c, t, f, o = dados["c"], dados["t"], dados["f"], dados["o"]
+    m, n = t.shape
+    pares_ok, arcos_ok = reducao["pares"], reducao["arcos"]
 
-# 5) Só pode processar sucata se a cidade for visitada
-for i in range(m):
+    pares = [(i, j) for i, j in zip(*np.nonzero(pares_ok)) if j != deposito]
+    arcos = list(zip(*np.nonzero(arcos_ok)))
+    pares = [(int(i), int(j)) for i, j in pares]
+    arcos = [(int(i), int(j), int(k)) for i, j, k in arcos]
+
+    model = Model("VRP_1viagem_por_prensa_reduzido", env=env)
+
+    # variáveis
+    x = model.addVars(arcos, vtype=GRB.BINARY, name="x")                      # arco i,j->k
+    u = model.addVars(pares, vtype=GRB.BINARY, name="u")                      # prensa i visita j
+    z = model.addVars(m, vtype=GRB.BINARY, name="z")                          # prensa ligada (= u[i,0])
+    eta = model.addVars(pares, lb=0.0, ub=n, vtype=GRB.CONTINUOUS, name="eta")  # MTZ
+
+    def visita(i, j):
+        return z[i] if j == deposito else u[i, j]
+
+    # Função Objetivo (receita constante: toda cidade é processada por completo)
+    term_transporte = x.prod({a: c[a] for a in arcos})
+    term_fixo = sum(f[i] * z[i] for i in range(m))
+    term_operacional = u.prod({(i, j): o[i] * t[i, j] for i, j in pares}) + sum(o[i] * t[i, deposito] * z[i] for i in range(m))
+
+    model.setObjective(reducao["receita"] - term_transporte - term_fixo - term_operacional, GRB.MAXIMIZE)
+
+    # -------- Restrições --------
+
+    # 1) Cada cidade só pode receber uma prensa
     for j in range(n):
-        model.addConstr(w[i, j] <= u[i, j])
-
-# 6) cada cidade processada exatamente uma vez (processamento completo)
-for j in range(n):
-    if j == deposito:
-        model.addConstr(sum(w[i, j] for i in range(m)) == 0)
-    else:
-        model.addConstr(sum(w[i, j] for i in range(m)) == 1, name=f"processa_uma_vez_{j}")
-
-# 7) O volume processado não pode ultrapassar o volume total da cidade (o deposito não possui sucata para ser processada)
-for j in range(n):
-    if j == deposito:
-        model.addConstr(vvol[j] == 0)
-    else:
-        model.addConstr(vvol[j] == S[j] * sum(w[i, j] for i in range(m)), name=f"liga_volume_{j}")
-
-# 8) z ligado a visitas: se alguma visita por i então z[i]=1
-for i in range(m):
-    model.addConstr(sum(u[i, j] for j in range(n)) <= n * z[i])
-
-# 9) MTZ eliminação de sub-tours (nós 1..n-1)
-for i in range(m):
-    for j in range(1, n):
-        for k in range(1, n):
-            if j == k:
-                continue
-            model.addConstr(eta[i, j] - eta[i, k] + n * x[i, j, k] <= n - 1)
+        if j == deposito:
+            continue
+        model.addConstr(u.sum("*", j) == 1, name=f"atribuicao_cidade_{j}")
+
+    # 2) Toda prensa que entrar em uma cidade precisa sair da cidade
+    for i, j in pares:
+        model.addConstr(x.sum(i, "*", j) == u[i, j], name=f"fluxo_entrada_u_{i}_{j}")
+        model.addConstr(x.sum(i, j, "*") == u[i, j], name=f"fluxo_saida_u_{i}_{j}")
+
+    # 3) Se prensa foi ativada, ela precisa sair uma vez do deposito e voltar uma única vez
+    for i in range(m):
+        model.addConstr(x.sum(i, deposito, "*") == z[i], name=f"saida_deposito_{i}")
+        model.addConstr(x.sum(i, "*", deposito) == z[i], name=f"entrada_deposito_{i}")
+
+    # 4) Se um arco foi criado, as cidades envolvidas foram visitadas
+    for i, j, k in arcos:
+        model.addConstr(x[i, j, k] <= visita(i, j))
+        model.addConstr(x[i, j, k] <= visita(i, k))
 
-# 10) força todas as prensas usadas 
-if USE_ALL_PRESSES:
+    # 8) z ligado a visitas: se alguma visita por i então z[i]=1
     for i in range(m):
-        model.addConstr(z[i] == 1)
-
-# --- parâmetros do solver
-if TIME_LIMIT and TIME_LIMIT > 0:
-    model.setParam("TimeLimit", TIME_LIMIT)
-model.setParam("MIPGap", 1e-3)
-
-# resolver
-print("Otimização iniciada...")
-model.optimize()
-
-# Se inviável -> computa IIS e exporta
-if model.Status == GRB.INFEASIBLE:
-    print("Modelo INVIÁVEL. Gerando IIS...")
-    model.computeIIS()
-    iis_name = "model_IIS.ilp"
-    model.write(iis_name)
-    print("IIS escrito em", iis_name)
-    # ainda tenta exportar um JSON vazio descrevendo a inviabilidade
-    summary = {"status": int(model.Status), "objective": None, "used_presses": [], "routes": []}
-    with open("solution_summary.json", "w") as f:
-        json.dump(summary, f, indent=2)
-    print("Arquivo solution_summary.json salvo (inviável).")
-    raise SystemExit(1)
-
-# Exporta solução (se viável ou subótima)
-# Tenta obter o objective value mesmo com TIME_LIMIT
-obj_value = None
-if model.Status in (GRB.OPTIMAL, GRB.SUBOPTIMAL):
-    obj_value = float(model.ObjVal)
-elif model.Status == GRB.TIME_LIMIT:
-    # Quando tempo limite é atingido, tenta pegar o best objective encontrado
+        model.addConstr(u.sum(i, "*") <= n * z[i])
+
+    # 9) MTZ eliminação de sub-tours (nós 1..n-1)
+    for i, j, k in arcos:
+        if j == deposito or k == deposito:
+            continue
+        model.addConstr(eta[i, j] - eta[i, k] + n * x[i, j, k] <= n - 1)
+
+    # 10) força todas as prensas usadas
+    if USE_ALL_PRESSES:
+        for i in range(m):
+            model.addConstr(z[i] == 1)
+
+    return model, {"x": x, "u": u, "w": None, "v": None, "z": z, "eta": eta}
+
+
+def carregar_parametros_ajustados(m, n, caminho=TUNED_PARAMS_FILE):
+    """
+    Retorna os parâmetros ajustados para a classe (m, n) ou None se não houver
+    """
+    if not os.path.exists(caminho):
+        return None
     try:
-        obj_value = float(model.ObjVal)
-    except:
-        obj_value = None
+        with open(caminho, "r") as fp:
+            cache = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    entrada = cache.get(f"{m}x{n}")
+    if entrada is None:
+        return None
+    return entrada.get("params")
+
+
+def configurar_solver(model, m, n, time_limit=TIME_LIMIT, mip_gap=MIP_GAP, usar_ajuste=USE_TUNED_PARAMS):
+    """
+    Define TimeLimit/MIPGap e aplica os parâmetros ajustados da classe (m, n)
+    """
+    if time_limit and time_limit > 0:
+        model.setParam("TimeLimit", time_limit)
+    model.setParam("MIPGap", mip_gap)
+
+    if not usar_ajuste:
+        return None
+    params = carregar_parametros_ajustados(m, n)
+    if params:
+        for nome, valor in params.items():
+            model.setParam(nome, valor)
+    return params
+
+
+def salvar_checkpoint(caminho, estado):
+    """
+    Grava o checkpoint de forma atômica (arquivo temporário + os.replace)
+    """
+    tmp = caminho + ".tmp"
+    with open(tmp, "w") as fp:
+        json.dump(estado, fp)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp, caminho)
+
+
+def carregar_checkpoint(caminho, hash_atual):
+    """
+    Retorna o checkpoint salvo para esta instância ou None
+    """
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, "r") as fp:
+            estado = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if estado.get("hash") != hash_atual:
+        return None
+    return estado
+
+
+def objetivo_checkpoint(dados, estado):
+    """
+    Recalcula (avaliador.py) o objetivo das rotas do checkpoint sob os dados e a configuração
+    atuais. Retorna None se as rotas forem inviáveis ou não reproduzirem o objetivo gravado.
+    """
+    import avaliador
+
+    m, n = dados["t"].shape
+    summary = {
+        "objective": estado.get("objetivo"),
+        "routes": [{"prensa": int(i), "arcos": arcos} for i, arcos in estado.get("arcos", {}).items()],
+    }
+    r = avaliador.avaliar_resumo(dados, summary)
+    if not r["viavel"] or not r["objetivo_confere"]:
+        return None
+    return r["objetivo"]
+
+
+def aplicar_mip_start(variaveis, arcos, prensas):
+    """
+    Usa uma solução (arcos por prensa e prensas ligadas) como MIP start.
+    Arcos que não existem no modelo (ex.: removidos no pré-processamento) são ignorados.
+    """
+    x, u, z = variaveis["x"], variaveis["u"], variaveis["z"]
+    usados = set()
+    for i, lista in arcos.items():
+        for j, k in lista:
+            usados.add((int(i), int(j), int(k)))
+    for chave, var in x.items():
+        var.Start = 1.0 if chave in usados else 0.0
+    visitas = {(i, k) for i, j, k in usados}
+    for chave, var in u.items():
+        var.Start = 1.0 if chave in visitas else 0.0
+    for i, var in z.items():
+        var.Start = 1.0 if i in prensas else 0.0
+
+
+def aplicar_inicio_pares(variaveis, pares):
+    """
+    MIP start parcial a partir de pares (prensa, cidade) visitados, ex.: visits_solution.csv.
+    Só u, w e z recebem valor; o Gurobi completa os arcos.
+    """
+    u, w, z = variaveis["u"], variaveis["w"], variaveis["z"]
+    for i, j in pares:
+        i, j = int(i), int(j)
+        if j == deposito:
+            continue
+        if (i, j) in u:
+            u[i, j].Start = 1.0
+        if w is not None:
+            w[i, j].Start = 1.0
+        z[i].Start = 1.0
+
+
+def resolver(dados, time_limit=TIME_LIMIT, ao_incumbente=None, env=None, verbose=True,
+             checkpoint=None, retomar=False, inicio_pares=None, ao_modelo=None, interromper=None):
+    """
+    Constrói, configura e otimiza o modelo. Retorna (model, variáveis).
+
+    ao_incumbente(evento) é chamado (na thread do Gurobi) a cada nova solução
+    incumbente e, no máximo uma vez por segundo, com o progresso do gap.
+    Com checkpoint=caminho, cada incumbente é gravado nesse arquivo; com
+    retomar=True, o checkpoint da mesma instância é usado como MIP start.
+    inicio_pares (array (k, 2) de pares prensa/cidade) vira um MIP start parcial.
+    ao_modelo(model) é chamado logo antes de otimizar (ex.: para model.terminate()
+    a partir de outra thread); interromper() é consultado em cada callback e, se
+    verdadeiro, encerra a otimização (cobre um pedido feito antes do optimize começar).
+    """
+    m, n = dados["t"].shape
+    if USE_TRAVEL_TIME:
+        dados = aplicar_tempo_viagem(dados)
+    # --- checkpoint da mesma instância (lido antes do pré-processamento: o incumbente é limitante inferior)
+    hash_atual = hash_instancia(dados) if checkpoint else None
+    anterior = carregar_checkpoint(checkpoint, hash_atual) if checkpoint and retomar else None
+    if checkpoint and retomar and anterior is None and verbose:
+        print(f"Nenhum checkpoint desta instância em {checkpoint}; começando do zero.")
+    # o objetivo gravado só vale como limitante depois de recalculado sobre os dados atuais
+    objetivo_anterior = objetivo_checkpoint(dados, anterior) if anterior is not None else None
+    if anterior is not None and objetivo_anterior is None:
+        if verbose:
+            print(f"Checkpoint em {checkpoint} inviável ou com objetivo divergente nesta configuração; "
+                  f"começando do zero.")
+        anterior = None
+
+    reducao = None
+    if PREPROCESS:
+        import preprocessamento
+        lb = None
+        if anterior is not None:
+            lb = max(objetivo_anterior, preprocessamento.limite_inferior(dados))
+        reducao = preprocessamento.preprocessar(dados, lb=lb)
+        if verbose:
+            preprocessamento.imprimir_estatisticas(reducao["estatisticas"])
+    model, variaveis = construir_modelo(dados, env=env, reducao=reducao)
+    if not verbose:
+        model.setParam("OutputFlag", 0)
+
+    # --- parâmetros do solver (a retomada usa só o que resta de time_limit)
+    tempo_anterior = anterior.get("tempo_total", 0.0) if anterior is not None else 0.0
+    if time_limit and time_limit > 0 and tempo_anterior > 0:
+        time_limit = max(time_limit - tempo_anterior, MIN_RESUME_TIME_LIMIT)
+    ajustados = configurar_solver(model, m, n, time_limit=time_limit)
+    if ajustados and verbose:
+        print(f"Parâmetros ajustados aplicados ({m}x{n}):", ajustados)
+
+    if inicio_pares is not None:
+        aplicar_inicio_pares(variaveis, inicio_pares)
+
+    # --- retomada (tem prioridade sobre inicio_pares)
+    if anterior is not None:
+        aplicar_mip_start(variaveis, anterior["arcos"], anterior["prensas"])
+        if verbose:
+            gap_txt = f"{anterior['gap'] * 100:.2f}%" if anterior.get("gap") is not None else "-"
+            restante = f", restam {time_limit:.1f}s" if time_limit and time_limit > 0 else ""
+            print(f"Retomando de {checkpoint}: objetivo={anterior['objetivo']:.2f} "
+                  f"gap={gap_txt} ({tempo_anterior:.1f}s já resolvidos{restante})")
+
+    if verbose:
+        print("Otimização iniciada...")
+    if ao_modelo is not None:
+        ao_modelo(model)
+    if ao_incumbente is None and not checkpoint and interromper is None:
+        model.optimize()
+        return model, variaveis
+
+    x, z = variaveis["x"], variaveis["z"]
+    chaves = list(x.keys())
+    lista_x = [x[ch] for ch in chaves]
+    lista_z = [z[i] for i in range(m)]
+    ultimo_progresso = [0.0]
+    ultimo_checkpoint = [None, time.monotonic()]   # (estado gravado, instante)
+
+    def limitante(bnd):
+        # sem limitante ainda o Gurobi devolve GRB.INFINITY: enviado como None
+        return None if abs(bnd) >= GRB.INFINITY else bnd
+
+    def gap(obj, bnd):
+        if limitante(bnd) is None:
+            return None
+        return abs(bnd - obj) / max(abs(obj), 1e-10)
+
+    def callback(model, where):
+        if interromper is not None and interromper():
+            model.terminate()
+            return
+        if where == GRB.Callback.MIPSOL:
+            obj = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+            bnd = model.cbGet(GRB.Callback.MIPSOL_OBJBND)
+            valores = model.cbGetSolution(lista_x)
+            arcos = {}
+            for (i, j, k), val in zip(chaves, valores):
+                if val > 0.5:
+                    arcos.setdefault(i, []).append([j, k])
+            evento = {
+                "evento": "incumbente",
+                "objetivo": obj,
+                "limitante": limitante(bnd),
+                "gap": gap(obj, bnd),
+                "tempo": model.cbGet(GRB.Callback.RUNTIME),
+                "arcos": arcos,
+            }
+            if checkpoint:
+                prensas = [i for i, val in enumerate(model.cbGetSolution(lista_z)) if val > 0.5]
+                estado = dict(
+                    evento,
+                    hash=hash_atual,
+                    prensas=prensas,
+                    tempo_total=tempo_anterior + evento["tempo"],
+                    data=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                )
+                salvar_checkpoint(checkpoint, estado)
+                ultimo_checkpoint[:] = [estado, time.monotonic()]
+            if ao_incumbente is not None:
+                ao_incumbente(evento)
+        elif where == GRB.Callback.MIP:
+            agora = time.monotonic()
+            if checkpoint and ultimo_checkpoint[0] is not None and agora - ultimo_checkpoint[1] >= CHECKPOINT_INTERVAL:
+                # mantém o tempo_total do checkpoint em dia mesmo sem novos incumbentes
+                ultimo_checkpoint[1] = agora
+                salvar_checkpoint(checkpoint, dict(ultimo_checkpoint[0],
+                                                   tempo_total=tempo_anterior + model.cbGet(GRB.Callback.RUNTIME)))
+            if ao_incumbente is None or agora - ultimo_progresso[0] < 1.0:
+                return
+            ultimo_progresso[0] = agora
+            obj = model.cbGet(GRB.Callback.MIP_OBJBST)
+            bnd = model.cbGet(GRB.Callback.MIP_OBJBND)
+            if model.cbGet(GRB.Callback.MIP_SOLCNT) > 0:
+                ao_incumbente({
+                    "evento": "progresso",
+                    "objetivo": obj,
+                    "limitante": limitante(bnd),
+                    "gap": gap(obj, bnd),
+                    "tempo": model.cbGet(GRB.Callback.RUNTIME),
+                })
+
+    model.optimize(callback)
+    return model, variaveis
 
-summary = {
-    "status": int(model.Status),
-    "objective": obj_value,
-    "used_presses": [],
-    "routes": []
-}
 
 def reconstruct_route_local(x_mat):
+    n = x_mat.shape[0]
     succ = {}
     for a in range(n):
         for b in range(n):
@@ -201,50 +564,123 @@ def reconstruct_route_local(x_mat):
             break
     return route
 
-# coleta solução
-if model.Status in (GRB.OPTIMAL, GRB.SUBOPTIMAL, GRB.TIME_LIMIT):
-    for i in range(m):
-        if z[i].X > 0.5:
-            summary["used_presses"].append(int(i))
-        # constrói matriz x para esta prensa
-        x_local = np.zeros((n, n))
-        for j in range(n):
-            for k in range(n):
-                try:
-                    x_local[j, k] = x[i, j, k].X
-                except:
-                    x_local[j, k] = 0.0
-        route = reconstruct_route_local(x_local)
-        arcs = [[route[t], route[t+1]] for t in range(len(route)-1)] if len(route) > 1 else []
+
+def montar_resumo(model, variaveis, dados):
+    """
+    Monta o dicionário exportado em solution_summary.json
+    """
+    m, n = dados["t"].shape
+    x, vvol, z = variaveis["x"], variaveis["v"], variaveis["z"]
+
+    # Tenta obter o objective value mesmo com TIME_LIMIT
+    obj_value = None
+    if model.Status in (GRB.OPTIMAL, GRB.SUBOPTIMAL):
+        obj_value = float(model.ObjVal)
+    elif model.Status == GRB.TIME_LIMIT:
+        # Quando tempo limite é atingido, tenta pegar o best objective encontrado
+        try:
+            obj_value = float(model.ObjVal)
+        except:
+            obj_value = None
+
+    summary = {
+        "status": int(model.Status),
+        "objective": obj_value,
+        "used_presses": [],
+        "routes": []
+    }
+
+    # coleta solução
+    if model.Status in (GRB.OPTIMAL, GRB.SUBOPTIMAL, GRB.TIME_LIMIT) and model.SolCount > 0:
+        # matriz x de todas as prensas (arcos ausentes do modelo reduzido ficam em 0)
+        x_mat = np.zeros((m, n, n))
+        for (i, j, k), val in model.getAttr("X", x).items():
+            x_mat[i, j, k] = val
         # coleta volumes para nós processados por qualquer prensa
         vols = {}
         for j in range(n):
-            try:
-                if vvol[j].X > 1e-6:
-                    vols[int(j)] = float(vvol[j].X)
-            except:
-                pass
-        summary["routes"].append({
-            "prensa": int(i),
-            "viagem": 0,
-            "rota": route,
-            "arcos": arcs,
-            "volumes": vols
-        })
-
-with open("solution_summary.json", "w") as f:
-    json.dump(summary, f, indent=2)
-
-print("Solução salva em solution_summary.json")
-print("Status:", model.Status, "Objective:", summary["objective"])
-print("Used presses:", summary["used_presses"])
-print("Number of routes exported:", len(summary["routes"]))
-
-# Log adicional para TIME_LIMIT
-if model.Status == GRB.TIME_LIMIT:
-    print("\n" + "="*60)
-    print("⏱ TEMPO LIMITE ATINGIDO")
-    print("="*60)
-    print(f"Best Objective Value encontrado: {summary['objective']}")
-    print(f"Gap: {model.MIPGap*100:.2f}%")
-    print("="*60)
+            if vvol is None:
+                # modelo reduzido: toda cidade (exceto o depósito) é processada por completo
+                if j != deposito:
+                    vols[int(j)] = float(dados["S"][j])
+            elif vvol[j].X > 1e-6:
+                vols[int(j)] = float(vvol[j].X)
+        for i in range(m):
+            if z[i].X > 0.5:
+                summary["used_presses"].append(int(i))
+            route = reconstruct_route_local(x_mat[i])
+            arcs = [[route[t], route[t+1]] for t in range(len(route)-1)] if len(route) > 1 else []
+            summary["routes"].append({
+                "prensa": int(i),
+                "viagem": 0,
+                "rota": route,
+                "arcos": arcs,
+                "volumes": vols
+            })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve o VRP de 1 viagem por prensa com Gurobi")
+    parser.add_argument("--resume", action="store_true",
+                        help="usa o checkpoint da mesma instância como MIP start")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help="arquivo de checkpoint")
+    parser.add_argument("--mip-start", choices=sorted(ingestao.SOLUCOES),
+                        help="usa visits_solution.csv (visitas) ou fullpressed_solution.csv (processamento) como MIP start")
+    args = parser.parse_args()
+
+    # -------- load data (.npy gerados por seu script) ----------
+    print("Carregando dados .npy...")
+    dados = carregar_dados()
+    m, n = dados["t"].shape
+    print(f"m={m}, n={n}")
+    print("Dados carregados.\n")
+
+    # --------- modelo + resolver ----------
+    inicio_pares = None
+    if args.mip_start:
+        inicio_pares = dados.get(args.mip_start)
+        if inicio_pares is None:
+            print(f"Aviso: {ingestao.SOLUCOES[args.mip_start]} indisponível para esta instância; sem MIP start.")
+
+    checkpoint = args.checkpoint if CHECKPOINT or args.resume else None
+    model, variaveis = resolver(dados, checkpoint=checkpoint, retomar=args.resume, inicio_pares=inicio_pares)
+
+    # Se inviável -> computa IIS e exporta
+    if model.Status == GRB.INFEASIBLE:
+        print("Modelo INVIÁVEL. Gerando IIS...")
+        if WRITE_IIS:
+            model.computeIIS()
+            iis_name = "model_IIS.ilp"
+            model.write(iis_name)
+            print("IIS escrito em", iis_name)
+        # ainda tenta exportar um JSON vazio descrevendo a inviabilidade
+        summary = {"status": int(model.Status), "objective": None, "used_presses": [], "routes": []}
+        with open("solution_summary.json", "w") as fp:
+            json.dump(summary, fp, indent=2)
+        print("Arquivo solution_summary.json salvo (inviável).")
+        raise SystemExit(1)
+
+    # Exporta solução (se viável ou subótima)
+    summary = montar_resumo(model, variaveis, dados)
+
+    with open("solution_summary.json", "w") as fp:
+        json.dump(summary, fp, indent=2)
+
+    print("Solução salva em solution_summary.json")
+    print("Status:", model.Status, "Objective:", summary["objective"])
+    print("Used presses:", summary["used_presses"])
+    print("Number of routes exported:", len(summary["routes"]))
+
+    # Log adicional para TIME_LIMIT
+    if model.Status == GRB.TIME_LIMIT:
+        print("\n" + "="*60)
+        print("⏱ TEMPO LIMITE ATINGIDO")
+        print("="*60)
+        print(f"Best Objective Value encontrado: {summary['objective']}")
+        print(f"Gap: {model.MIPGap*100:.2f}%")
+        print("="*60)
+
+
+if __name__ == "__main__":
+    main()
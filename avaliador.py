@@ -0,0 +1,212 @@
+"""
+Avaliador vetorizado de soluções e verificador de viabilidade
+
+Uma solução é representada por
+  sucessor    (m, n)  int: próxima cidade da prensa i depois de j (-1 = prensa não sai de j)
+  atribuicao  (n,)    int: prensa que atende cada cidade (-1 no depósito); opcional
+e um lote por arrays (B, m, n) / (B, n). Para cada solução do lote são recalculados
+receita, transporte (c_ijk), custo fixo (f) e operacional (o*t_ij), e contadas as
+violações de cobertura, fluxo, subrotas e depósito — tudo com operações NumPy sobre
+o lote inteiro, sem laços em Python por solução.
+
+Uso:
+    python avaliador.py                              # confere solution_summary.json contra data/
+    python avaliador.py outra_solucao.json --pasta data --benchmark 5000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+import alg
+
+TOLERANCIA = 1e-6
+
+
+def de_resumo(summary, m, n):
+    """
+    Converte um solution_summary.json em (sucessor (m, n), atribuicao (n,), indices).
+    indices conta as entradas com prensa fora de [0, m) ou cidade fora de [0, n),
+    que são descartadas em vez de indexar os arrays.
+    """
+    sucessor = np.full((m, n), -1, dtype=np.int64)
+    atribuicao = np.full(n, -1, dtype=np.int64)
+    indices = 0
+    for bloco in summary["routes"]:
+        i = bloco["prensa"]
+        for j, k in bloco["arcos"]:
+            if not (0 <= i < m and 0 <= j < n and 0 <= k < n):
+                indices += 1
+                continue
+            sucessor[i, j] = k
+            if k != alg.deposito:
+                atribuicao[k] = i
+    return sucessor, atribuicao, indices
+
+
+def de_resumos(summaries, m, n):
+    """
+    Lote (B, m, n) / (B, n) / (B,) a partir de vários resumos
+    """
+    trios = [de_resumo(s, m, n) for s in summaries]
+    return (np.stack([t[0] for t in trios]), np.stack([t[1] for t in trios]),
+            np.array([t[2] for t in trios], dtype=np.int64))
+
+
+def avaliar(dados, sucessor, atribuicao=None, indices=None):
+    """
+    Avalia um lote de soluções. sucessor: (B, m, n) ou (m, n); atribuicao: (B, n), (n,) ou None;
+    indices: (B,) ou escalar com as entradas inválidas descartadas por de_resumo, ou None.
+    Retorna dicionário de arrays (B,): receita, transporte, fixo, operacional, objetivo,
+    violacoes (dict de contagens por tipo) e viavel.
+    """
+    c, t, S, f, o = dados["c"], dados["t"], dados["S"], dados["f"], dados["o"]
+    m, n = t.shape
+    dep = alg.deposito
+
+    sucessor = np.asarray(sucessor, dtype=np.int64)
+    if sucessor.ndim == 2:
+        sucessor = sucessor[None]
+    B = sucessor.shape[0]
+    if atribuicao is not None:
+        atribuicao = np.broadcast_to(np.asarray(atribuicao, dtype=np.int64), (B, n))
+
+    cidades = np.arange(n) != dep
+    valido = (sucessor >= 0) & (sucessor < n)                      # (B, m, n) prensa i sai de j
+    destino = np.where(valido, sucessor, 0)
+    prensa_idx = np.arange(m)[None, :, None]
+    origem_idx = np.arange(n)[None, None, :]
+
+    # grau de entrada por (b, i, k) com um único bincount sobre índices achatados
+    lote_idx = np.arange(B)[:, None, None]
+    plano = ((lote_idx * m + prensa_idx) * n + destino)[valido]
+    grau_entrada = np.bincount(plano, minlength=B * m * n).reshape(B, m, n)
+
+    visita = valido | (grau_entrada > 0)                           # u[i,j]
+    usada = visita.any(axis=2)                                      # z[i]
+    atendimentos = visita[:, :, cidades].sum(axis=1)                # (B, n-1)
+    atendida = atendimentos > 0
+
+    # custos
+    receita = alg.p * (atendida * S[cidades]).sum(axis=1)
+    transporte = np.where(valido, c[prensa_idx, origem_idx, destino], 0.0).sum(axis=(1, 2))
+    fixo = (usada * f).sum(axis=1)
+    operacional = (visita * (o[:, None] * t)[None]).sum(axis=(1, 2))
+    objetivo = receita - transporte - fixo - operacional
+
+    violacoes = {}
+    # cobertura: toda cidade (exceto o depósito) atendida por exatamente uma prensa
+    violacoes["cobertura"] = (atendimentos != 1).sum(axis=1)
+    if atribuicao is not None:
+        dona = np.where(atendimentos == 1, visita[:, :, cidades].argmax(axis=1), -1)
+        violacoes["atribuicao"] = (atribuicao[:, cidades] != dona).sum(axis=1)
+    # fluxo: entra uma vez e sai uma vez de cada nó visitado; sem laços j -> j e sem destinos inválidos
+    saida = valido.astype(np.int64)
+    laco = valido & (sucessor == origem_idx)
+    fora = (sucessor >= n) | (sucessor < -1)
+    violacoes["fluxo"] = ((grau_entrada != saida) | laco | fora).sum(axis=(1, 2))
+    # depósito: prensa usada sai e volta ao depósito; obrigatoriedade de todas as prensas
+    deposito_ruim = usada & ~valido[:, :, dep]
+    if alg.USE_ALL_PRESSES:
+        deposito_ruim |= ~usada
+    violacoes["deposito"] = deposito_ruim.sum(axis=1)
+
+    # subrotas: cidades visitadas não alcançáveis a partir do depósito seguindo os sucessores
+    alcancado = np.zeros((B, m, n), dtype=bool)
+    b_idx = np.arange(B)[:, None]
+    i_idx = np.arange(m)[None, :]
+    pos = np.where(valido[:, :, dep], destino[:, :, dep], -1)      # (B, m)
+    for _ in range(n):
+        ativo = (pos >= 0) & (pos != dep)
+        if not ativo.any():
+            break
+        alcancado[b_idx, i_idx, np.where(ativo, pos, 0)] |= ativo
+        seguinte = sucessor[b_idx, i_idx, np.where(ativo, pos, 0)]
+        # sucessor fora de [0, n) encerra a caminhada (já contado em violacoes["fluxo"])
+        seguinte_ok = (seguinte >= 0) & (seguinte < n)
+        seguinte = np.where(seguinte_ok, seguinte, 0)
+        pos = np.where(ativo & seguinte_ok & ~alcancado[b_idx, i_idx, seguinte], seguinte, -1)
+    violacoes["subrotas"] = (visita & ~alcancado)[:, :, cidades].sum(axis=(1, 2))
+
+    if indices is not None:
+        violacoes["indices"] = np.broadcast_to(np.asarray(indices, dtype=np.int64), (B,))
+
+    if dados.get("viavel") is not None:
+        violacoes["viabilidade"] = (visita & ~dados["viavel"][None])[:, :, cidades].sum(axis=(1, 2))
+
+    total = sum(violacoes.values())
+    return {
+        "receita": receita,
+        "transporte": transporte,
+        "fixo": fixo,
+        "operacional": operacional,
+        "objetivo": objetivo,
+        "violacoes": violacoes,
+        "viavel": total == 0,
+    }
+
+
+def avaliar_resumo(dados, summary):
+    """
+    Avalia um único solution_summary.json e compara com o objetivo declarado
+    """
+    m, n = dados["t"].shape
+    sucessor, atribuicao, indices = de_resumo(summary, m, n)
+    r = avaliar(dados, sucessor, atribuicao, indices)
+    resultado = {chave: float(r[chave][0]) for chave in ("receita", "transporte", "fixo", "operacional", "objetivo")}
+    resultado["violacoes"] = {chave: int(v[0]) for chave, v in r["violacoes"].items()}
+    resultado["viavel"] = bool(r["viavel"][0])
+    declarado = summary.get("objective")
+    resultado["objetivo_declarado"] = declarado
+    resultado["objetivo_confere"] = (
+        declarado is not None
+        and abs(declarado - resultado["objetivo"]) <= TOLERANCIA * max(1.0, abs(declarado))
+    )
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcula o objetivo e verifica a viabilidade de uma solução")
+    parser.add_argument("solucao", nargs="?", default="solution_summary.json")
+    parser.add_argument("--pasta", default="data")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="B",
+                        help="mede soluções/s avaliando um lote de B cópias")
+    args = parser.parse_args()
+
+    dados = alg.carregar_dados(args.pasta)
+    if alg.USE_TRAVEL_TIME:
+        dados = alg.aplicar_tempo_viagem(dados)
+    with open(args.solucao, "r") as fp:
+        summary = json.load(fp)
+
+    r = avaliar_resumo(dados, summary)
+    print("=" * 60)
+    print(f"AVALIAÇÃO DE {args.solucao}")
+    print("=" * 60)
+    print(f"Receita:            {r['receita']:>16,.2f}")
+    print(f"Transporte:         {r['transporte']:>16,.2f}")
+    print(f"Custo fixo:         {r['fixo']:>16,.2f}")
+    print(f"Custo operacional:  {r['operacional']:>16,.2f}")
+    print(f"Objetivo recalculado: {r['objetivo']:,.2f}")
+    print(f"Objetivo declarado:   {r['objetivo_declarado']}")
+    print(f"Confere: {'sim' if r['objetivo_confere'] else 'NÃO'}")
+    print("Violações:", ", ".join(f"{k}={v}" for k, v in r["violacoes"].items()))
+    print(f"Solução viável: {'sim' if r['viavel'] else 'NÃO'}")
+
+    if args.benchmark > 0:
+        m, n = dados["t"].shape
+        sucessor, atribuicao, _ = de_resumo(summary, m, n)
+        lote_s = np.repeat(sucessor[None], args.benchmark, axis=0)
+        lote_a = np.repeat(atribuicao[None], args.benchmark, axis=0)
+        inicio = time.perf_counter()
+        avaliar(dados, lote_s, lote_a)
+        duracao = time.perf_counter() - inicio
+        print(f"\nBenchmark: {args.benchmark} soluções em {duracao:.3f}s ({args.benchmark / duracao:,.0f} soluções/s)")
+
+    return 0 if r["viavel"] and r["objetivo_confere"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
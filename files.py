@@ -1,33 +1,51 @@
 import numpy as np
 import os
 
-# Create data directory if it doesn't exist
-os.makedirs("data", exist_ok=True)
-
 m = 10
 n = 50
-np.random.seed(42)
-
-c_ijk = np.random.uniform(500, 5000, size=(m,n,n))
-S = np.random.randint(50,500,size=n)
-capacidade_i = np.random.uniform(5,10,size=m)
-t_ij = np.zeros((m,n))
-for i in range(m):
-    for j in range(n):
-        horas = S[j] / capacidade_i[i]
-        t_ij[i,j] = horas  
-f = np.random.uniform(1000,5000,size=m)
-o = np.random.uniform(1,10,size=m)
-
-# SAVE as .npy (robusto)
-np.save("data/c_ijk.npy", c_ijk)
-np.save("data/t_ij.npy", t_ij)
-np.save("data/S.npy", S)
-np.save("data/f.npy", f)
-np.save("data/o.npy", o)
-np.save("data/capacidade_i.npy", capacidade_i)
-
-# also save CSV for interoperability if needed:
-np.savetxt("data/S.csv", S, delimiter=",", fmt="%.2f")
-np.savetxt("data/f.csv", f, delimiter=",", fmt="%.2f")
-np.savetxt("data/o.csv", o, delimiter=",", fmt="%.2f")
+
+
+def gerar_instancia(m, n, seed=42):
+    """
+    Gera uma instância aleatória com m prensas e n cidades (cidade 0 = depósito)
+    """
+    np.random.seed(seed)
+
+    c_ijk = np.random.uniform(500, 5000, size=(m,n,n))
+    S = np.random.randint(50,500,size=n)
+    capacidade_i = np.random.uniform(5,10,size=m)
+    t_ij = np.zeros((m,n))
+    for i in range(m):
+        for j in range(n):
+            horas = S[j] / capacidade_i[i]
+            t_ij[i,j] = horas
+    f = np.random.uniform(1000,5000,size=m)
+    o = np.random.uniform(1,10,size=m)
+
+    return {"c": c_ijk, "t": t_ij, "S": S, "f": f, "o": o, "capacidade": capacidade_i}
+
+
+def salvar_instancia(inst, pasta="data"):
+    """
+    Salva a instância em .npy (e alguns vetores em .csv)
+    """
+    # Create data directory if it doesn't exist
+    os.makedirs(pasta, exist_ok=True)
+
+    # SAVE as .npy (robusto)
+    np.save(os.path.join(pasta, "c_ijk.npy"), inst["c"])
+    np.save(os.path.join(pasta, "t_ij.npy"), inst["t"])
+    np.save(os.path.join(pasta, "S.npy"), inst["S"])
+    np.save(os.path.join(pasta, "f.npy"), inst["f"])
+    np.save(os.path.join(pasta, "o.npy"), inst["o"])
+    np.save(os.path.join(pasta, "capacidade_i.npy"), inst["capacidade"])
+
+    # also save CSV for interoperability if needed:
+    np.savetxt(os.path.join(pasta, "S.csv"), inst["S"], delimiter=",", fmt="%.2f")
+    np.savetxt(os.path.join(pasta, "f.csv"), inst["f"], delimiter=",", fmt="%.2f")
+    np.savetxt(os.path.join(pasta, "o.csv"), inst["o"], delimiter=",", fmt="%.2f")
+
+
+if __name__ == "__main__":
+    salvar_instancia(gerar_instancia(m, n))
+    print("Dados salvos em data/")
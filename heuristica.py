@@ -0,0 +1,281 @@
+"""
+Heurística gulosa (vizinho mais próximo) para o VRP de 1 viagem por prensa
+
+A cada passo escolhe o par (prensa, cidade livre) de menor custo incremental:
+transporte a partir da posição atual da prensa + custo operacional o*t
+(+ custo fixo e operacional do depósito se a prensa ainda não foi ligada).
+Produz um resumo no mesmo formato de solution_summary.json, útil como
+solução inicial, limitante inferior ou resposta rápida no servico.py.
+busca_local melhora as rotas com realocações e trocas de cidades entre
+posições/prensas e inversão de trechos (2-opt) até não haver movimento de melhora.
+"""
+
+import numpy as np
+
+import alg
+
+
+def objetivo_rotas(dados, rotas):
+    """
+    Lucro de um conjunto de rotas (uma lista de cidades por prensa, começando e terminando no depósito)
+    """
+    c, t, S, f, o = dados["c"], dados["t"], dados["S"], dados["f"], dados["o"]
+    deposito = alg.deposito
+    total = 0.0
+    for i, rota in enumerate(rotas):
+        if len(rota) <= 2:
+            continue
+        cidades = [j for j in rota if j != deposito]
+        total += alg.p * float(np.sum(S[cidades]))
+        total -= float(np.sum(c[i, rota[:-1], rota[1:]]))
+        total -= f[i] + o[i] * t[i, deposito] + o[i] * float(np.sum(t[i, cidades]))
+    return total
+
+
+def _resumo(dados, rotas, objetivo, metodo):
+    m = dados["t"].shape[0]
+    deposito = alg.deposito
+    summary = {
+        "status": None,
+        "metodo": metodo,
+        "objective": objetivo,
+        "used_presses": [int(i) for i in range(m) if len(rotas[i]) > 2],
+        "routes": []
+    }
+    for i, rota in enumerate(rotas):
+        summary["routes"].append({
+            "prensa": int(i),
+            "viagem": 0,
+            "rota": rota,
+            "arcos": [[rota[s], rota[s + 1]] for s in range(len(rota) - 1)],
+            "volumes": {int(j): float(dados["S"][j]) for j in rota if j != deposito}
+        })
+    return summary
+
+
+def heuristica_gulosa(dados):
+    """
+    Retorna um resumo no formato de solution_summary.json
+    (objective = None se alguma cidade ficou sem prensa viável)
+    """
+    c, t, f, o = dados["c"], dados["t"], dados["f"], dados["o"]
+    m, n = t.shape
+    deposito = alg.deposito
+
+    custo_op = o[:, None] * t                      # (m, n)
+    custo_ligar = f + custo_op[:, deposito]        # (m,)
+    if dados.get("viavel") is not None:
+        custo_op = np.where(dados["viavel"], custo_op, np.inf)
+    livre = np.ones(n, dtype=bool)
+    livre[deposito] = False
+    atual = np.full(m, deposito)
+    ativa = np.zeros(m, dtype=bool)
+    rotas = [[deposito] for _ in range(m)]
+    encalhada = False
+
+    def atribuir(i, k):
+        rotas[i].append(int(k))
+        atual[i] = k
+        ativa[i] = True
+        livre[k] = False
+
+    # se todas as prensas são obrigatórias, cada uma precisa visitar ao menos uma cidade
+    if alg.USE_ALL_PRESSES:
+        for i in range(m):
+            if not livre.any():
+                break
+            custo = c[i, deposito] + custo_op[i]
+            custo[~livre] = np.inf
+            if np.isfinite(custo.min()):
+                atribuir(i, np.argmin(custo))
+
+    while livre.any():
+        custo = c[np.arange(m), atual, :] + custo_op + np.where(ativa, 0.0, custo_ligar)[:, None]
+        custo[:, ~livre] = np.inf
+        i, k = np.unravel_index(np.argmin(custo), custo.shape)
+        if not np.isfinite(custo[i, k]):
+            # cidades restantes sem nenhuma prensa viável
+            encalhada = True
+            break
+        atribuir(i, k)
+
+    for i in range(m):
+        if ativa[i]:
+            rotas[i].append(deposito)
+
+    return _resumo(dados, rotas, None if encalhada else objetivo_rotas(dados, rotas), "heuristica")
+
+
+def busca_local(dados, summary, max_passadas=50):
+    """
+    Melhora as rotas de um resumo com realocação de uma cidade (para outra posição
+    ou prensa), troca de duas cidades e inversão de trechos de uma rota (2-opt
+    assimétrico), aceitando o melhor movimento de cada cidade/rota.
+    Retorna um novo resumo (o original é devolvido se não houver objetivo).
+    """
+    if summary["objective"] is None:
+        return summary
+    c, t, f, o = dados["c"], dados["t"], dados["f"], dados["o"]
+    m, n = t.shape
+    deposito = alg.deposito
+    custo_op = o[:, None] * t
+    if dados.get("viavel") is not None:
+        custo_op = np.where(dados["viavel"], custo_op, np.inf)
+    custo_ligar = f + o * t[:, deposito]
+    rotas = [list(bloco["rota"]) if len(bloco["rota"]) > 2 else [deposito] for bloco in summary["routes"]]
+    eps = 1e-9
+
+    def dois_opt(i, rota):
+        """
+        Melhor inversão rota[s..e] (custos assimétricos: os arcos invertidos mudam de custo)
+        """
+        r = np.array(rota)
+        ida = np.concatenate(([0.0], np.cumsum(c[i, r[:-1], r[1:]])))
+        volta = np.concatenate(([0.0], np.cumsum(c[i, r[1:], r[:-1]])))
+        s_, e_ = np.triu_indices(len(r) - 1, k=1)
+        ok = (s_ >= 1) & (e_ <= len(r) - 2)
+        s_, e_ = s_[ok], e_[ok]
+        if len(s_) == 0:
+            return 0.0, None
+        antes = c[i, r[s_ - 1], r[s_]] + (ida[e_] - ida[s_]) + c[i, r[e_], r[e_ + 1]]
+        depois = c[i, r[s_ - 1], r[e_]] + (volta[e_] - volta[s_]) + c[i, r[s_], r[e_ + 1]]
+        q = int(np.argmax(antes - depois))
+        return antes[q] - depois[q], (s_[q], e_[q])
+
+    def ganho_remocao(a, rota, pos):
+        k, ant, prox = rota[pos], rota[pos - 1], rota[pos + 1]
+        if len(rota) == 3:
+            return c[a, ant, k] + c[a, k, prox] + custo_op[a, k] + custo_ligar[a]
+        return c[a, ant, k] + c[a, k, prox] - c[a, ant, prox] + custo_op[a, k]
+
+    # inf - inf (pares inviáveis) vira nan e é descartado
+    with np.errstate(invalid="ignore"):
+        for _ in range(max_passadas):
+            melhorou = False
+            for k in range(n):
+                if k == deposito:
+                    continue
+                a = next(i for i in range(m) if k in rotas[i])
+                pos = rotas[a].index(k)
+                if len(rotas[a]) == 3 and alg.USE_ALL_PRESSES:
+                    remover = None
+                else:
+                    remover = ganho_remocao(a, rotas[a], pos)
+
+                # arcos u -> v (sem os vizinhos de k) e posições de cidades de todas as rotas
+                P, U, V, B, Q = [], [], [], [], []
+                for i, rota in enumerate(rotas):
+                    for s in range(len(rota) - 1):
+                        if rota[s] != k and rota[s + 1] != k:
+                            P.append(i)
+                            U.append(rota[s])
+                            V.append(rota[s + 1])
+                        if s > 0 and rota[s] != k and not (i == a and abs(s - pos) <= 1):
+                            B.append(i)
+                            Q.append(s)
+                melhor, movimento = 0.0, None
+
+                # realocação: inserir k entre u -> v de qualquer rota
+                if remover is not None and P:
+                    P, U, V = np.array(P), np.array(U), np.array(V)
+                    inserir = c[P, U, k] + c[P, k, V] - c[P, U, V] + custo_op[P, k]
+                    q = int(np.argmin(inserir))
+                    if remover - inserir[q] > melhor + eps:
+                        melhor, movimento = remover - inserir[q], ("realocar", P[q], U[q], V[q])
+                if remover is not None and not alg.USE_ALL_PRESSES:
+                    for b in range(m):
+                        if len(rotas[b]) <= 2:
+                            novo = c[b, deposito, k] + c[b, k, deposito] + custo_op[b, k] + custo_ligar[b]
+                            if remover - novo > melhor + eps:
+                                melhor, movimento = remover - novo, ("ligar", b, None, None)
+
+                # troca: k ocupa a posição de l e vice-versa (posições não adjacentes)
+                if B:
+                    B, Q = np.array(B), np.array(Q)
+                    L = np.array([rotas[b][q] for b, q in zip(B, Q)])
+                    AL = np.array([rotas[b][q - 1] for b, q in zip(B, Q)])
+                    DL = np.array([rotas[b][q + 1] for b, q in zip(B, Q)])
+                    ak, dk = rotas[a][pos - 1], rotas[a][pos + 1]
+                    delta = (c[a, ak, k] + c[a, k, dk] + custo_op[a, k]
+                             + c[B, AL, L] + c[B, L, DL] + custo_op[B, L]
+                             - c[a, ak, L] - c[a, L, dk] - custo_op[a, L]
+                             - c[B, AL, k] - c[B, k, DL] - custo_op[B, k])
+                    delta = np.where(np.isnan(delta), -np.inf, delta)
+                    q = int(np.argmax(delta))
+                    if delta[q] > melhor + eps:
+                        melhor, movimento = delta[q], ("trocar", B[q], Q[q], None)
+
+                if movimento is None:
+                    continue
+                melhorou = True
+                tipo, b, x1, x2 = movimento
+                if tipo == "trocar":
+                    rotas[a][pos], rotas[b][x1] = rotas[b][x1], k
+                    continue
+                rotas[a].pop(pos)
+                if len(rotas[a]) == 2:
+                    rotas[a] = [deposito]
+                if tipo == "ligar":
+                    rotas[b] = [deposito, k, deposito]
+                else:
+                    rota = rotas[b]
+                    q = next(s for s in range(len(rota) - 1) if rota[s] == x1 and rota[s + 1] == x2)
+                    rota.insert(q + 1, k)
+
+            for i, rota in enumerate(rotas):
+                if len(rota) < 4:
+                    continue
+                ganho, trecho = dois_opt(i, rota)
+                if ganho > eps:
+                    s_, e_ = trecho
+                    rota[s_:e_ + 1] = rota[s_:e_ + 1][::-1]
+                    melhorou = True
+            if not melhorou:
+                break
+
+    rotas = [rota if len(rota) > 2 else [deposito] for rota in rotas]
+    return _resumo(dados, rotas, objetivo_rotas(dados, rotas), summary.get("metodo", "heuristica") + "+busca_local")
+
+
+def busca_local_iterada(dados, summary, iteracoes=30, tamanho_perturbacao=3, seed=0):
+    """
+    Busca local iterada: perturba a melhor solução realocando algumas cidades ao
+    acaso (respeitando viabilidade e USE_ALL_PRESSES), reaplica busca_local e
+    mantém a melhor. Determinística para um mesmo seed.
+    """
+    melhor = busca_local(dados, summary)
+    if melhor["objective"] is None:
+        return melhor
+    t = dados["t"]
+    m, n = t.shape
+    deposito = alg.deposito
+    viavel = dados.get("viavel")
+    rng = np.random.default_rng(seed)
+
+    for _ in range(iteracoes):
+        rotas = [list(bloco["rota"]) if len(bloco["rota"]) > 2 else [deposito] for bloco in melhor["routes"]]
+        for k in rng.choice(np.arange(1, n), size=min(tamanho_perturbacao, n - 1), replace=False):
+            a = next(i for i in range(m) if k in rotas[i])
+            if len(rotas[a]) == 3 and alg.USE_ALL_PRESSES:
+                continue
+            destinos = [b for b in range(m) if len(rotas[b]) > 2 and (viavel is None or viavel[b, k])]
+            destinos = [b for b in destinos if b != a or len(rotas[a]) > 3]
+            if not destinos:
+                continue
+            rotas[a].remove(k)
+            if len(rotas[a]) == 2:
+                rotas[a] = [deposito]
+            b = destinos[rng.integers(len(destinos))]
+            if len(rotas[b]) <= 2:
+                continue
+            rotas[b].insert(int(rng.integers(1, len(rotas[b]))), int(k))
+        # uma prensa pode ter ficado vazia e o destino sorteado ser ela: garante k em alguma rota
+        visitadas = {j for rota in rotas for j in rota}
+        if len(visitadas - {deposito}) != n - 1:
+            continue
+        perturbada = _resumo(dados, [r if len(r) > 2 else [deposito] for r in rotas],
+                             objetivo_rotas(dados, rotas), melhor["metodo"])
+        candidata = busca_local(dados, perturbada)
+        if candidata["objective"] > melhor["objective"] + 1e-9:
+            melhor = candidata
+    return melhor
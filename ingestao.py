@@ -0,0 +1,219 @@
+"""
+Ingestão das matrizes CSV de data/ com cache binário
+
+  TD_jk.csv                  (n, n)  tempo de viagem entre cidades
+  travel_time_ij.csv         (m, n)  tempo de viagem da base de cada prensa até cada cidade
+  feasible_ij.csv            (m, n)  1 se a prensa i pode atender a cidade j
+  visits_solution.csv        pares (i, j): prensa i visita a cidade j
+  fullpressed_solution.csv   pares (i, j): prensa i processa toda a cidade j
+
+Cada CSV é lido uma única vez com np.loadtxt (arquivos grandes em blocos de
+linhas, com max_rows) e salvo como .npy em data/.cache/, indexado pelo sha256 do arquivo. O índice
+guarda também mtime/tamanho, então enquanto o arquivo não muda nem o hash
+precisa ser recalculado; ele só é regravado quando alguma entrada muda. As
+formas são validadas contra m/n de t_ij.npy.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import warnings
+
+import numpy as np
+
+# -------- CONFIG ----------
+PASTA_CACHE = ".cache"          # subpasta de data/
+BYTES_LEITURA_DIRETA = 64 << 20 # até este tamanho o CSV é lido numa única chamada
+LINHAS_POR_BLOCO = 1_000_000    # acima dele, linhas lidas por chamada de np.loadtxt
+# --------------------------
+
+MATRIZES = {
+    # nome no dicionário de dados: (arquivo, forma esperada em função de m, n)
+    "TD_jk": ("TD_jk.csv", lambda m, n: (n, n)),
+    "travel_time_ij": ("travel_time_ij.csv", lambda m, n: (m, n)),
+    "viavel": ("feasible_ij.csv", lambda m, n: (m, n)),
+}
+# o serviço carrega pastas em threads do executor: uma leitura/escrita do índice por vez
+_TRAVA_INDICE = threading.Lock()
+
+SOLUCOES = {
+    "visitas": "visits_solution.csv",
+    "processamento": "fullpressed_solution.csv",
+}
+
+
+def _numerica(linha):
+    try:
+        float(linha.split(b",")[0])
+        return True
+    except ValueError:
+        return False
+
+
+def ler_csv(caminho, linhas_por_bloco=LINHAS_POR_BLOCO, bytes_leitura_direta=BYTES_LEITURA_DIRETA):
+    """
+    Lê um CSV numérico (cabeçalho opcional). Retorna array 2D float64.
+    """
+    with open(caminho, "rb") as fp:
+        primeira = fp.readline()
+    if not primeira.strip():
+        return np.zeros((0, 0))
+    cabecalho = 0 if _numerica(primeira) else 1
+
+    if os.path.getsize(caminho) <= bytes_leitura_direta:
+        # com o caminho o numpy usa o leitor em C sobre o arquivo inteiro (bem mais rápido
+        # que iterar linhas de um arquivo aberto)
+        return np.loadtxt(caminho, delimiter=",", skiprows=cabecalho, ndmin=2)
+
+    blocos = []
+    with open(caminho, "r") as fp:
+        if cabecalho:
+            fp.readline()
+        with warnings.catch_warnings():
+            # a última chamada, no fim do arquivo, avisa que não há dados
+            warnings.simplefilter("ignore", UserWarning)
+            while True:
+                bloco = np.loadtxt(fp, delimiter=",", max_rows=linhas_por_bloco, ndmin=2)
+                if bloco.size == 0:
+                    break
+                if blocos and bloco.shape[1] != blocos[0].shape[1]:
+                    raise ValueError(f"{caminho}: linhas com número de colunas diferente de {blocos[0].shape[1]}")
+                blocos.append(bloco)
+    if not blocos:
+        return np.zeros((0, 0))
+    return np.concatenate(blocos)
+
+
+def _sha256(caminho):
+    h = hashlib.sha256()
+    with open(caminho, "rb") as fp:
+        for bloco in iter(lambda: fp.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _ler_indice(indice_path):
+    if not os.path.exists(indice_path):
+        return {}
+    try:
+        with open(indice_path, "r") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_indice(indice_path, indice):
+    """
+    Escrita atômica com arquivo temporário exclusivo na mesma pasta
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(indice_path), prefix="indice-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            json.dump(indice, fp, indent=2)
+        os.replace(tmp, indice_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def carregar_csv_cache(caminho):
+    """
+    Retorna o CSV como array, usando/atualizando o cache .npy em data/.cache/
+    """
+    pasta, nome = os.path.split(caminho)
+    pasta_cache = os.path.join(pasta, PASTA_CACHE)
+    indice_path = os.path.join(pasta_cache, "indice.json")
+    os.makedirs(pasta_cache, exist_ok=True)
+
+    info = os.stat(caminho)
+    with _TRAVA_INDICE:
+        entrada = _ler_indice(indice_path).get(nome)
+    if entrada and entrada["mtime_ns"] == info.st_mtime_ns and entrada["tamanho"] == info.st_size:
+        sha = entrada["sha256"]
+    else:
+        sha = _sha256(caminho)
+
+    npy = os.path.join(pasta_cache, f"{os.path.splitext(nome)[0]}-{sha[:16]}.npy")
+    if os.path.exists(npy):
+        arr = np.load(npy)
+    else:
+        arr = ler_csv(caminho)
+        fd, tmp = tempfile.mkstemp(dir=pasta_cache, suffix=".npy")
+        with os.fdopen(fd, "wb") as fp:
+            np.save(fp, arr)
+        os.replace(tmp, npy)
+
+    nova = {"mtime_ns": info.st_mtime_ns, "tamanho": info.st_size, "sha256": sha,
+            "npy": os.path.basename(npy)}
+    if nova != entrada:
+        with _TRAVA_INDICE:
+            # relê o índice para não perder entradas gravadas por outra carga nesse meio tempo
+            indice = _ler_indice(indice_path)
+            antiga = indice.get(nome)
+            indice[nome] = nova
+            _gravar_indice(indice_path, indice)
+        # remove a versão antiga deste arquivo
+        if antiga and antiga.get("npy") and antiga["npy"] != nova["npy"]:
+            antigo = os.path.join(pasta_cache, antiga["npy"])
+            if os.path.exists(antigo):
+                os.remove(antigo)
+    return arr
+
+
+def carregar_extras(pasta, m, n, estrito=False, verbose=True):
+    """
+    Carrega as matrizes/soluções CSV que existirem em 'pasta' e valida contra (m, n).
+    Arquivos ausentes ou incompatíveis viram None (ou ValueError se estrito=True).
+    """
+    extras = {}
+
+    def incompativel(msg):
+        if estrito:
+            raise ValueError(msg)
+        if verbose:
+            print(f"Aviso: {msg} - ignorado")
+
+    for chave, (arquivo, forma) in MATRIZES.items():
+        caminho = os.path.join(pasta, arquivo)
+        extras[chave] = None
+        if not os.path.exists(caminho):
+            continue
+        arr = carregar_csv_cache(caminho)
+        if arr.shape != forma(m, n):
+            incompativel(f"{arquivo} tem forma {arr.shape}, esperado {forma(m, n)} (m={m}, n={n})")
+            continue
+        extras[chave] = arr.astype(bool) if chave == "viavel" else arr
+
+    for chave, arquivo in SOLUCOES.items():
+        caminho = os.path.join(pasta, arquivo)
+        extras[chave] = None
+        if not os.path.exists(caminho):
+            continue
+        pares = carregar_csv_cache(caminho).astype(int).reshape(-1, 2)
+        if len(pares) and (pares[:, 0].max() >= m or pares[:, 1].max() >= n or pares.min() < 0):
+            incompativel(f"{arquivo} tem índices fora de m={m}, n={n}")
+            continue
+        extras[chave] = pares
+
+    return extras
+
+
+def tempo_viagem(dados, deposito=0):
+    """
+    Tempo de viagem por arco (m, n, n): TD_jk entre cidades; nos arcos que tocam o
+    depósito usa travel_time_ij (base da prensa -> cidade), se disponível.
+    Retorna None se TD_jk não estiver disponível.
+    """
+    td = dados.get("TD_jk")
+    if td is None:
+        return None
+    m = dados["t"].shape[0]
+    tempo = np.repeat(td[None, :, :], m, axis=0)
+    base = dados.get("travel_time_ij")
+    if base is not None:
+        tempo[:, deposito, :] = base
+        tempo[:, :, deposito] = base
+    return tempo
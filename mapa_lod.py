@@ -0,0 +1,228 @@
+"""
+Renderização com nível de detalhe (LOD) para mapas de rotas grandes
+
+Usado por visualizar_rotas.py quando o número de cidades é grande:
+  - cidades agrupadas em células de uma grade (marcadores de cluster)
+  - rótulos apenas para as cidades mais importantes (maior volume)
+  - arcos como segmentos retos, um LineCollection por prensa
+  - saída HTML/SVG autocontida, com uma camada por prensa que pode ser ligada/desligada;
+    só os rótulos importantes vão no arquivo, os demais são criados no navegador,
+    com zoom, apenas para as cidades visíveis
+"""
+
+import html
+import json
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_hex
+from matplotlib.lines import Line2D
+
+# -------- CONFIG ----------
+MAX_CELULAS = 400      # número aproximado de marcadores de cluster
+MAX_ROTULOS = 40       # cidades rotuladas (por importância) sem zoom
+ZOOM_ROTULOS = 4.0     # no HTML, rótulos de todas as cidades visíveis a partir deste zoom
+MAX_ROTULOS_ZOOM = 500 # no HTML, máximo de rótulos criados para a área visível
+DPI_LOD = 100
+# --------------------------
+
+
+def agrupar_cidades(coords, max_celulas=MAX_CELULAS):
+    """
+    Agrupa as cidades numa grade regular.
+    Retorna (centros, contagens, celula_de_cada_cidade)
+    """
+    minimo = coords.min(axis=0)
+    extensao = np.maximum(coords.max(axis=0) - minimo, 1e-9)
+    lado = max(1, int(np.sqrt(max_celulas)))
+    celulas = np.minimum(((coords - minimo) / extensao * lado).astype(int), lado - 1)
+    chave = celulas[:, 0] * lado + celulas[:, 1]
+
+    unicas, rotulo, contagens = np.unique(chave, return_inverse=True, return_counts=True)
+    centros = np.zeros((len(unicas), 2))
+    np.add.at(centros, rotulo, coords)
+    centros /= contagens[:, None]
+    return centros, contagens, rotulo
+
+
+def cidades_rotuladas(importancia, deposito=0, max_rotulos=MAX_ROTULOS):
+    """
+    Índices das cidades mais importantes (o depósito é tratado à parte)
+    """
+    imp = np.asarray(importancia, dtype=float).copy()
+    imp[deposito] = -np.inf
+    k = min(max_rotulos, len(imp) - 1)
+    if k <= 0:
+        return np.array([], dtype=int)
+    return np.argpartition(-imp, k - 1)[:k]
+
+
+def segmentos_por_prensa(coords, routes):
+    """
+    {prensa: array (k, 2, 2)} com os arcos de cada prensa como segmentos retos
+    """
+    segmentos = {}
+    for bloco in routes:
+        arcos = np.asarray(bloco["arcos"], dtype=int).reshape(-1, 2)
+        arcos = arcos[arcos[:, 0] != arcos[:, 1]]
+        if len(arcos) == 0:
+            continue
+        segmentos[bloco["prensa"]] = coords[arcos]
+    return segmentos
+
+
+def cores_prensas(used_presses):
+    cmap = plt.colormaps["hsv"]
+    return {pid: cmap(idx / max(len(used_presses), 1)) for idx, pid in enumerate(used_presses)}
+
+
+def renderizar_png_lod(coords, routes, used_presses, titulo, caminho, importancia, deposito=0, dpi=DPI_LOD):
+    """
+    Gráfico completo em LOD: custo de desenho ~ nº de clusters + nº de prensas
+    """
+    cores = cores_prensas(used_presses)
+    centros, contagens, _ = agrupar_cidades(coords)
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.set_title(titulo, fontsize=16, weight="bold", color="darkgreen")
+
+    # clusters: área do marcador proporcional ao número de cidades
+    ax.scatter(centros[:, 0], centros[:, 1], s=20 + 6 * contagens, c="black", alpha=0.35,
+               linewidths=0, zorder=2, rasterized=True)
+
+    # uma coleção de segmentos por prensa
+    legend_elements = [
+        Line2D([0], [0], marker='o', markersize=8, color='black', alpha=0.35, linestyle='none', label="Cidades (agrupadas)"),
+        Line2D([0], [0], marker='s', markersize=10, color='red', linestyle='none', label="Depósito"),
+    ]
+    for pid, segs in segmentos_por_prensa(coords, routes).items():
+        cor = cores.get(pid, "gray")
+        ax.add_collection(LineCollection(segs, colors=[cor], linewidths=0.8, alpha=0.7, zorder=3))
+        legend_elements.append(Line2D([0], [0], color=cor, lw=3, label=f"Prensa {pid}"))
+
+    # depósito e rótulos apenas das cidades mais importantes
+    dx, dy = coords[deposito]
+    ax.scatter([dx], [dy], c="red", s=200, marker="s", zorder=5, edgecolors="darkred", linewidth=1.5)
+    for j in cidades_rotuladas(importancia, deposito):
+        ax.annotate(str(j), coords[j], fontsize=7, ha="center", va="bottom", zorder=6)
+
+    ax.autoscale()
+    ax.grid(True, linestyle="--", alpha=0.2)
+    ax.set_xlabel("Coordenada X")
+    ax.set_ylabel("Coordenada Y")
+    ncol = max(1, len(legend_elements) // 12 + 1)
+    ax.legend(handles=legend_elements, fontsize=8, loc="upper left", framealpha=0.9, ncol=ncol)
+
+    fig.tight_layout()
+    fig.savefig(caminho, dpi=dpi)
+    plt.close(fig)
+
+
+def _caminho_svg(segs):
+    """
+    Todos os segmentos de uma prensa num único atributo 'd' de <path>
+    """
+    return " ".join(f"M{a[0]:.1f} {a[1]:.1f}L{b[0]:.1f} {b[1]:.1f}" for a, b in segs)
+
+
+def exportar_html(coords, routes, used_presses, titulo, caminho, importancia, deposito=0):
+    """
+    HTML autocontido com SVG: camadas por prensa, clusters sem zoom e cidades/rótulos com zoom
+    """
+    cores = cores_prensas(used_presses)
+    centros, contagens, _ = agrupar_cidades(coords)
+    rotuladas = set(int(j) for j in cidades_rotuladas(importancia, deposito))
+
+    # eixo y do SVG cresce para baixo
+    pts = coords.copy()
+    pts[:, 1] = -pts[:, 1]
+    centros = centros.copy()
+    centros[:, 1] = -centros[:, 1]
+    minimo = pts.min(axis=0) - 5
+    extensao = pts.max(axis=0) - pts.min(axis=0) + 10
+    viewbox = f"{minimo[0]:.1f} {minimo[1]:.1f} {extensao[0]:.1f} {extensao[1]:.1f}"
+    escala = float(max(extensao)) / 100.0
+
+    camadas = []
+    controles = []
+    for pid, segs in segmentos_por_prensa(pts, routes).items():
+        cor = to_hex(cores.get(pid, "gray"))
+        camadas.append(f'<path id="prensa-{pid}" class="prensa" stroke="{cor}" d="{_caminho_svg(segs)}"/>')
+        controles.append(
+            f'<label><input type="checkbox" checked data-prensa="{pid}">'
+            f'<span style="color:{cor}">&#9632;</span> Prensa {pid}</label>'
+        )
+
+    clusters = "".join(
+        f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{(0.4 + 0.25 * np.sqrt(c)) * escala:.2f}"><title>{c} cidade(s)</title></circle>'
+        for (x, y), c in zip(centros, contagens)
+    )
+    # coordenadas de todas as cidades num único array; o path de pontos e os rótulos
+    # com zoom são montados no navegador
+    coordenadas = ",".join(f"{v:.1f}" for v in pts.ravel())
+    rotulos = "".join(
+        f'<text x="{pts[j, 0]:.1f}" y="{pts[j, 1] - 0.6 * escala:.1f}">{j}</text>'
+        for j in sorted(rotuladas)
+    )
+    dx, dy = pts[deposito]
+    lado = 2.5 * escala
+
+    documento = f"""<!DOCTYPE html>
+<html lang="pt-br"><head><meta charset="utf-8"><title>{html.escape(titulo)}</title>
+<style>
+body{{margin:0;font-family:sans-serif;display:flex;height:100vh}}
+#painel{{width:220px;overflow:auto;padding:8px;border-right:1px solid #ccc;font-size:13px}}
+#painel label{{display:block}}
+svg{{flex:1;cursor:grab}}
+.prensa{{fill:none;stroke-width:{0.25 * escala:.2f};stroke-opacity:.75}}
+#clusters circle{{fill:#000;fill-opacity:.3}}
+#cidades{{stroke:#000;stroke-width:{0.8 * escala:.2f};stroke-linecap:round;stroke-opacity:.6;display:none}}
+#rotulos text,#rotulos-zoom text{{font-size:{1.4 * escala:.2f}px;text-anchor:middle}}
+svg.zoom #clusters{{display:none}} svg.zoom #cidades{{display:inline}}
+svg.zoom #rotulos text,#rotulos-zoom text{{font-size:{0.5 * escala:.2f}px}}
+</style></head>
+<body>
+<div id="painel"><b>{html.escape(titulo)}</b><p>Roda do mouse: zoom / arrastar: mover</p>
+<label><input type="checkbox" id="todas" checked> <b>Todas</b></label>
+{"".join(controles)}
+</div>
+<svg id="mapa" viewBox="{viewbox}" xmlns="http://www.w3.org/2000/svg">
+<g id="clusters">{clusters}</g>
+<path id="cidades"/>
+{"".join(camadas)}
+<rect x="{dx - lado / 2:.1f}" y="{dy - lado / 2:.1f}" width="{lado:.1f}" height="{lado:.1f}" fill="red" stroke="darkred"><title>Depósito</title></rect>
+<g id="rotulos">{rotulos}</g>
+<g id="rotulos-zoom"></g>
+</svg>
+<script>
+const svg=document.getElementById("mapa");const vb0={json.dumps([float(v) for v in viewbox.split()])};
+let vb=vb0.slice();const ZOOM={ZOOM_ROTULOS},MAX_ROTULOS={MAX_ROTULOS_ZOOM},DY={0.6 * escala:.2f};
+const P=[{coordenadas}];const FIXOS=new Set({json.dumps(sorted(rotuladas) + [int(deposito)])});
+let d="";for(let j=0;j<P.length;j+=2)d+="M"+P[j]+" "+P[j+1]+"h0";
+document.getElementById("cidades").setAttribute("d",d);
+const gz=document.getElementById("rotulos-zoom");let pendente=false;
+function rotular(){{pendente=false;gz.textContent="";if(!svg.classList.contains("zoom"))return;
+let k=0;for(let j=0;j<P.length/2&&k<MAX_ROTULOS;j++){{if(FIXOS.has(j))continue;const x=P[2*j],y=P[2*j+1];
+if(x<vb[0]||x>vb[0]+vb[2]||y<vb[1]||y>vb[1]+vb[3])continue;
+const t=document.createElementNS("http://www.w3.org/2000/svg","text");t.setAttribute("x",x);t.setAttribute("y",y-DY);
+t.textContent=j;gz.appendChild(t);k++;}}}}
+function aplicar(){{svg.setAttribute("viewBox",vb.join(" "));svg.classList.toggle("zoom",vb0[2]/vb[2]>=ZOOM);
+if(!pendente){{pendente=true;requestAnimationFrame(rotular);}}}}
+svg.addEventListener("wheel",e=>{{e.preventDefault();const r=svg.getBoundingClientRect();
+const fx=(e.clientX-r.left)/r.width,fy=(e.clientY-r.top)/r.height,k=e.deltaY<0?0.8:1.25;
+const w=vb[2]*k,h=vb[3]*k;vb=[vb[0]+(vb[2]-w)*fx,vb[1]+(vb[3]-h)*fy,w,h];aplicar();}});
+let arrasto=null;svg.addEventListener("mousedown",e=>{{arrasto=[e.clientX,e.clientY];}});
+window.addEventListener("mouseup",()=>{{arrasto=null;}});
+window.addEventListener("mousemove",e=>{{if(!arrasto)return;const r=svg.getBoundingClientRect();
+vb[0]-=(e.clientX-arrasto[0])*vb[2]/r.width;vb[1]-=(e.clientY-arrasto[1])*vb[3]/r.height;arrasto=[e.clientX,e.clientY];aplicar();}});
+const caixas=[...document.querySelectorAll("input[data-prensa]")];
+caixas.forEach(c=>c.addEventListener("change",()=>{{
+document.getElementById("prensa-"+c.dataset.prensa).style.display=c.checked?"":"none";}}));
+document.getElementById("todas").addEventListener("change",e=>{{caixas.forEach(c=>{{c.checked=e.target.checked;
+c.dispatchEvent(new Event("change"));}});}});
+</script>
+</body></html>
+"""
+    with open(caminho, "w", encoding="utf-8") as fp:
+        fp.write(documento)
@@ -0,0 +1,275 @@
+"""
+Pré-processamento e redução da instância antes de construir o modelo
+
+Reduções que não alteram o objetivo ótimo:
+  - depósito: u[i,0] = z[i] (o depósito é visitado por toda prensa ligada),
+    w[i,0], v[0] e eta[i,0] saem do modelo
+  - w e v: como cada cidade é atendida e processada por completo, w[i,j] = u[i,j]
+    e v[j] = S[j]; a receita vira constante p * sum(S)
+  - x[i,j,j] saem do modelo (no modelo original já eram fixados em 0 por restrição)
+  - pares (prensa, cidade) proibidos em feasible_ij.csv e os arcos que os usam
+  - fixação por custo reduzido: arcos (i,j,k) que só aparecem em soluções piores
+    que uma solução conhecida (busca local sobre a heurística gulosa ou o
+    incumbente do checkpoint) são removidos; pares sem arco de entrada ou de
+    saída restante também saem
+
+Limitante superior: relaxação de atribuição (AP). Cada cidade tem exatamente um
+arco de entrada e um de saída e cada prensa uma saída e uma volta ao depósito,
+mas a prensa de cada arco é escolhida livremente. O arco i: j -> k custa
+c[i,j,k] + o[i]*t[i,k] (k cidade), e os arcos que saem do depósito somam
+f[i] + o[i]*t[i,0]. Com os duais (a, b) da AP, qualquer solução que usa o arco
+(i,j,k) tem lucro <= receita - AP - (custo - a[j] - b[k]).
+
+Em instâncias com custos homogêneos o intervalo entre a AP e a solução
+conhecida costuma ser maior que o custo reduzido dos arcos e a fixação não
+remove nada; a redução garantida é a do depósito, de w/v e da diagonal.
+
+Uso:
+    python preprocessamento.py              # estatísticas para data/
+    python preprocessamento.py --verificar  # ótimo do modelo reduzido == original
+"""
+
+import argparse
+
+import numpy as np
+
+import alg
+import heuristica
+
+MAX_RODADAS = 10
+TOLERANCIA = 1e-6
+ITERACOES_BUSCA = 30    # perturbações da busca local iterada usada como limitante inferior
+
+
+def limite_inferior(dados):
+    """
+    Lucro de uma solução viável (heurística gulosa + busca local iterada) ou -inf se ela não servir
+    """
+    summary = heuristica.heuristica_gulosa(dados)
+    summary = heuristica.busca_local_iterada(dados, summary, iteracoes=ITERACOES_BUSCA)
+    m = dados["t"].shape[0]
+    if summary["objective"] is None or (alg.USE_ALL_PRESSES and len(summary["used_presses"]) < m):
+        return -np.inf
+    return summary["objective"]
+
+
+def _atribuicao(C):
+    """
+    Problema de atribuição de custo mínimo (húngaro, caminhos aumentantes).
+    Retorna (custo, a, b, coluna_de_cada_linha) com C[r, s] - a[r] - b[s] >= 0.
+    """
+    N = C.shape[0]
+    a = np.zeros(N + 1)
+    b = np.zeros(N + 1)
+    dono = np.zeros(N + 1, dtype=int)        # linha atribuída a cada coluna (1-indexado, 0 = livre)
+    anterior = np.zeros(N + 1, dtype=int)
+    for r in range(1, N + 1):
+        dono[0] = r
+        s0 = 0
+        folga = np.full(N + 1, np.inf)
+        visitada = np.zeros(N + 1, dtype=bool)
+        while True:
+            visitada[s0] = True
+            r0 = dono[s0]
+            livre = ~visitada[1:]
+            atual = C[r0 - 1] - a[r0] - b[1:]
+            melhora = livre & (atual < folga[1:])
+            folga[1:][melhora] = atual[melhora]
+            anterior[1:][melhora] = s0
+            candidatas = np.where(livre, folga[1:], np.inf)
+            s1 = int(np.argmin(candidatas)) + 1
+            delta = candidatas[s1 - 1]
+            a[dono[visitada]] += delta
+            b[visitada] -= delta
+            folga[1:][livre] -= delta
+            s0 = s1
+            if dono[s0] == 0:
+                break
+        while s0:
+            s1 = anterior[s0]
+            dono[s0] = dono[s1]
+            s0 = s1
+    coluna = np.zeros(N, dtype=int)
+    coluna[dono[1:] - 1] = np.arange(N)
+    return -b[0], a[1:], b[1:], coluna
+
+
+def _limitantes(dados, arcos, receita):
+    """
+    Limitante superior global (AP) e por arco (m,n,n)
+    """
+    c, t, f, o = dados["c"], dados["t"], dados["f"], dados["o"]
+    m, n = t.shape
+    dep = alg.deposito
+
+    custo = c + (o[:, None] * t)[:, None, :]
+    custo[:, :, dep] = c[:, :, dep]
+    custo[:, dep, :] += (f + o * t[:, dep])[:, None]
+    custo = np.where(arcos, custo, np.inf)
+
+    # linhas: saída de cada cidade e saída do depósito por prensa; colunas: entradas
+    cidades = np.arange(n) != dep
+    slot = np.empty((m, n), dtype=int)
+    slot[:, cidades] = np.arange(n - 1)[None, :]
+    slot[:, dep] = n - 1 + np.arange(m)
+    N = n - 1 + m
+    C = np.full((N, N), np.inf)
+    linhas = np.broadcast_to(slot[:, :, None], custo.shape)
+    colunas = np.broadcast_to(slot[:, None, :], custo.shape)
+    np.minimum.at(C, (linhas, colunas), custo)
+    if not alg.USE_ALL_PRESSES:
+        # prensa desligada: sua saída do depósito casa com a própria volta, sem custo
+        C[n - 1 + np.arange(m), n - 1 + np.arange(m)] = 0.0
+
+    finito = np.isfinite(C)
+    if not finito.any(axis=1).all() or not finito.any(axis=0).all():
+        return np.inf, np.full(custo.shape, np.inf)
+    grande = np.abs(C[finito]).sum() + 1.0
+    total, a, b, coluna = _atribuicao(np.where(finito, C, grande))
+    if not finito[np.arange(N), coluna].all():
+        # relaxação inviável: nada a cortar por limitante
+        return np.inf, np.full(custo.shape, np.inf)
+
+    limite = receita - total
+    with np.errstate(invalid="ignore"):
+        lim_arco = limite - (custo - a[slot][:, :, None] - b[slot][:, None, :])
+    return limite, lim_arco
+
+
+def preprocessar(dados, lb=None):
+    """
+    Retorna um dicionário de redução para alg.construir_modelo(dados, reducao=...).
+    lb: lucro de uma solução conhecida (senão, calculado por limite_inferior).
+    """
+    t, S = dados["t"], dados["S"]
+    m, n = t.shape
+    dep = alg.deposito
+    cidades = np.arange(n) != dep
+
+    pares = np.ones((m, n), dtype=bool)
+    if dados.get("viavel") is not None:
+        pares &= dados["viavel"]
+        pares[:, dep] = True
+    arcos = pares[:, :, None] & pares[:, None, :]
+    arcos[:, np.arange(n), np.arange(n)] = False
+    pares_viaveis = int(pares[:, cidades].sum())
+    arcos_viaveis = int(arcos.sum())
+
+    receita = alg.p * float(np.sum(S)) - alg.p * float(S[dep])
+    if lb is None:
+        lb = limite_inferior(dados)
+    corte = lb - TOLERANCIA * max(1.0, abs(lb)) if np.isfinite(lb) else -np.inf
+
+    limite = np.inf
+    rodadas = 0
+    for rodadas in range(1, MAX_RODADAS + 1):
+        limite, lim_arco = _limitantes(dados, arcos, receita)
+        novos_arcos = arcos & ~(lim_arco < corte)
+        # cidade atendida pela prensa i precisa de um arco de entrada e um de saída de i
+        novos_pares = pares & novos_arcos.any(axis=1) & novos_arcos.any(axis=2)
+        novos_pares[:, dep] = True
+        novos_arcos &= novos_pares[:, :, None] & novos_pares[:, None, :]
+        mudou = (novos_pares != pares).any() or (novos_arcos != arcos).any()
+        pares, arcos = novos_pares, novos_arcos
+        if not mudou:
+            break
+
+    estatisticas = {
+        "rodadas": rodadas,
+        "limite_inferior": float(lb),
+        "limite_superior": float(limite),
+        "pares_inviaveis": int(m * (n - 1) - pares_viaveis),
+        "pares_removidos": int(pares_viaveis - pares[:, cidades].sum()),
+        "pares_restantes": int(pares[:, cidades].sum()),
+        # x[i,j,j]: já fixados em 0 no modelo original, aqui só deixam de ser criados
+        "arcos_diagonais": int(m * n),
+        "arcos_inviaveis": int(m * n * (n - 1) - arcos_viaveis),
+        "arcos_removidos": int(arcos_viaveis - arcos.sum()),
+        "arcos_restantes": int(arcos.sum()),
+        # x, u, w, v, z, eta do modelo original
+        "variaveis_originais": int(m * n * n + 3 * m * n + n + m),
+        # x, u (sem depósito), z, eta (sem depósito)
+        "variaveis_reduzidas": int(arcos.sum() + 2 * pares[:, cidades].sum() + m),
+    }
+    return {"pares": pares, "arcos": arcos, "receita": receita, "estatisticas": estatisticas}
+
+
+def imprimir_estatisticas(est):
+    print("Pré-processamento:")
+    print(f"  limitantes: inferior={est['limite_inferior']:.2f} superior={est['limite_superior']:.2f} ({est['rodadas']} rodada(s))")
+    print(f"  pares (prensa, cidade): {est['pares_inviaveis']} inviáveis, "
+          f"{est['pares_removidos']} removidos por limitante (restam {est['pares_restantes']})")
+    print(f"  arcos: {est['arcos_diagonais']} diagonais, {est['arcos_inviaveis']} inviáveis, "
+          f"{est['arcos_removidos']} removidos por limitante (restam {est['arcos_restantes']})")
+    print(f"  variáveis: {est['variaveis_originais']} -> {est['variaveis_reduzidas']}")
+
+
+def _otimo(dados, reducao):
+    model, _ = alg.construir_modelo(dados, reducao=reducao)
+    model.setParam("OutputFlag", 0)
+    model.setParam("MIPGap", 0.0)
+    model.optimize()
+    valor = model.ObjVal if model.SolCount > 0 else None
+    model.dispose()
+    return valor
+
+
+def verificar(casos=((2, 8, 1), (3, 11, 2), (2, 12, 3), (4, 9, 4)), fracao_proibida=0.3):
+    """
+    Compara o ótimo do modelo original com o do reduzido em instâncias pequenas, com e
+    sem máscara de viabilidade e com USE_ALL_PRESSES ligado e desligado.
+    Retorna o número de divergências (0 = ok).
+    """
+    from files import gerar_instancia
+
+    original = alg.USE_ALL_PRESSES
+    divergencias = 0
+    removidos = 0
+    try:
+        for todas in (True, False):
+            alg.USE_ALL_PRESSES = todas
+            for m, n, seed in casos:
+                for com_mascara in (False, True):
+                    dados = gerar_instancia(m, n, seed=seed)
+                    dados["capacidade"] = None
+                    if com_mascara:
+                        rng = np.random.default_rng(seed)
+                        viavel = rng.random((m, n)) >= fracao_proibida
+                        viavel[rng.integers(m, size=n), np.arange(n)] = True   # toda cidade com alguma prensa
+                        viavel[:, alg.deposito] = True
+                        dados["viavel"] = viavel
+                    reducao = preprocessar(dados)
+                    est = reducao["estatisticas"]
+                    cheio, reduzido = _otimo(dados, None), _otimo(dados, reducao)
+                    ok = (cheio is None and reduzido is None) or (
+                        cheio is not None and reduzido is not None
+                        and abs(cheio - reduzido) <= 1e-6 * max(1.0, abs(cheio)))
+                    divergencias += not ok
+                    removidos += est["arcos_removidos"] + est["pares_removidos"]
+                    print(f"{'todas' if todas else 'livre':>5} {m}x{n} seed={seed} "
+                          f"{'máscara' if com_mascara else '-':>7}: original={cheio} reduzido={reduzido} "
+                          f"arcos removidos={est['arcos_removidos']} inviáveis={est['arcos_inviaveis']} "
+                          f"pares removidos={est['pares_removidos']} {'ok' if ok else 'DIVERGE'}")
+    finally:
+        alg.USE_ALL_PRESSES = original
+    print(f"{removidos} arcos/pares removidos por limitante; {divergencias} divergência(s)")
+    return divergencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-processamento / redução do modelo")
+    parser.add_argument("--pasta", default="data")
+    parser.add_argument("--verificar", action="store_true",
+                        help="compara o ótimo do modelo original e do reduzido em instâncias pequenas")
+    args = parser.parse_args()
+    if args.verificar:
+        return 1 if verificar() else 0
+    dados = alg.carregar_dados(args.pasta)
+    if alg.USE_TRAVEL_TIME:
+        dados = alg.aplicar_tempo_viagem(dados)
+    imprimir_estatisticas(preprocessar(dados)["estatisticas"])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,468 @@
+"""
+Serviço local assíncrono de resolução (asyncio)
+
+Aceita instâncias (arrays em JSON ou o caminho de uma pasta data/), coloca-as
+numa fila limitada atendida por um número fixo de workers (alg.py ou a
+heurística gulosa) e transmite aos clientes cada incumbente e atualização de
+gap assim que aparecem. Submissões idênticas (mesmo hash de conteúdo, método
+e tempo limite) reaproveitam o mesmo job. Jobs finalizados perdem os arcos dos
+eventos de incumbente (o resultado final continua completo) e só os
+MAX_JOBS_FINALIZADOS mais recentes são mantidos.
+
+Resolvedores: resolvedor(dados, time_limit, ao_incumbente, cancelamento) -> resumo.
+cancelamento.registrar(model) permite que parar() chame model.terminate() no Gurobi
+em execução; cancelamento.cancelado cobre um pedido feito antes do optimize começar.
+
+Protocolo: uma mensagem JSON por linha, via TCP local ou socket Unix.
+  {"op": "submeter", "pasta": "data" | "dados": {...}, "metodo": "mip", "time_limit": 60}
+      -> {"ok": true, "job": "...", "duplicado": false}
+  {"op": "acompanhar", "job": "..."}
+      -> uma linha por evento (fila, inicio, incumbente, progresso, ...) até "concluido" ou "erro"
+  {"op": "estado", "job": "..."}
+      -> {"ok": true, "estado": "...", "eventos": N}
+
+Uso:
+    python servico.py --porta 8765 --workers 2
+    python servico.py --unix /tmp/vrp.sock
+    python servico.py --porta 8765 --enviar data --metodo heuristica   (cliente)
+    python servico.py --autoteste        (ClienteServico contra resolvedores substitutos)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import gurobipy
+import numpy as np
+
+import alg
+import heuristica
+
+# -------- CONFIG ----------
+HOST = "127.0.0.1"
+PORTA = 8765
+WORKERS = 2
+MAX_FILA = 16
+LIMITE_LINHA = 2 ** 30   # instâncias enviadas como JSON podem ser grandes
+MAX_JOBS_FINALIZADOS = 256
+# --------------------------
+
+ESTADOS_FINAIS = ("concluido", "erro")
+
+
+class Cancelamento:
+    """
+    Liga um job ao modelo Gurobi em execução para que ele possa ser interrompido de outra thread
+    """
+
+    def __init__(self):
+        self.cancelado = False
+        self._modelo = None
+        self._trava = threading.Lock()
+
+    def registrar(self, model):
+        with self._trava:
+            self._modelo = model
+            if self.cancelado:
+                model.terminate()
+
+    def liberar(self):
+        with self._trava:
+            self._modelo = None
+
+    def cancelar(self):
+        with self._trava:
+            self.cancelado = True
+            if self._modelo is not None:
+                self._modelo.terminate()
+
+
+def _resolver_mip(dados, time_limit, ao_incumbente, cancelamento):
+    with gurobipy.Env() as env:
+        if time_limit is None:
+            time_limit = alg.TIME_LIMIT
+        try:
+            model, variaveis = alg.resolver(dados, time_limit=time_limit, ao_incumbente=ao_incumbente,
+                                            env=env, verbose=False, ao_modelo=cancelamento.registrar,
+                                            interromper=lambda: cancelamento.cancelado)
+        finally:
+            cancelamento.liberar()
+        summary = alg.montar_resumo(model, variaveis, dados)
+        model.dispose()
+    return summary
+
+
+def _resolver_heuristica(dados, time_limit, ao_incumbente, cancelamento):
+    summary = heuristica.heuristica_gulosa(dados)
+    ao_incumbente({"evento": "incumbente", "objetivo": summary["objective"], "limitante": None,
+                   "gap": None, "tempo": 0.0})
+    return summary
+
+
+RESOLVEDORES = {
+    "mip": _resolver_mip,
+    "heuristica": _resolver_heuristica,
+}
+
+
+def dados_do_pedido(pedido):
+    """
+    Converte o pedido (pasta ou arrays em listas) no dicionário de dados de alg.py
+    """
+    if "pasta" in pedido:
+        return alg.carregar_dados(pedido["pasta"])
+    brutos = pedido["dados"]
+    dados = {chave: np.asarray(brutos[chave], dtype=float) for chave in ("c", "t", "S", "f", "o")}
+    m, n = dados["t"].shape
+    if dados["c"].shape != (m, n, n) or dados["S"].shape != (n,) or dados["f"].shape != (m,) or dados["o"].shape != (m,):
+        raise ValueError(f"dimensões inconsistentes para m={m}, n={n}")
+    dados["capacidade"] = None
+    return dados
+
+
+class Job:
+    def __init__(self, job_id, dados, metodo, time_limit):
+        self.id = job_id
+        self.dados = dados
+        self.metodo = metodo
+        self.time_limit = time_limit
+        self.estado = "fila"
+        self.eventos = []
+        self.resultado = None
+        self.cancelamento = Cancelamento()
+        self._novo = asyncio.Event()
+
+    def publicar(self, evento):
+        """
+        Registra um evento e acorda quem está acompanhando (chamar no loop)
+        """
+        self.eventos.append(evento)
+        self._novo.set()
+        self._novo = asyncio.Event()
+
+    def compactar(self):
+        """
+        Remove os arcos dos eventos intermediários (o resultado final já tem as rotas)
+        """
+        self.eventos = [{k: v for k, v in e.items() if k != "arcos"} for e in self.eventos]
+
+    async def acompanhar(self, desde=0):
+        """
+        Gera todos os eventos a partir de 'desde', esperando os próximos até o fim do job
+        """
+        i = desde
+        while True:
+            novo = self._novo
+            while i < len(self.eventos):
+                yield self.eventos[i]
+                i += 1
+            if self.estado in ESTADOS_FINAIS:
+                return
+            await novo.wait()
+
+
+class ServicoResolucao:
+    def __init__(self, workers=WORKERS, max_fila=MAX_FILA, resolvedores=None):
+        self.workers = workers
+        self.resolvedores = dict(RESOLVEDORES if resolvedores is None else resolvedores)
+        self.fila = asyncio.Queue(maxsize=max_fila)
+        self.jobs = {}
+        self._finalizados = deque()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._tarefas = []
+        self._servidor = None
+
+    # ------------------------------------------------------------
+    # jobs
+    # ------------------------------------------------------------
+    def submeter(self, dados, metodo="mip", time_limit=None):
+        """
+        Enfileira uma instância. Retorna (job, duplicado).
+        Lança asyncio.QueueFull se a fila estiver cheia.
+        """
+        if metodo not in self.resolvedores:
+            raise ValueError(f"método desconhecido: {metodo}")
+        job_id = f"{alg.hash_instancia(dados)[:16]}-{metodo}-{time_limit}"
+        existente = self.jobs.get(job_id)
+        if existente is not None and existente.estado != "erro":
+            return existente, True
+
+        job = Job(job_id, dados, metodo, time_limit)
+        self.fila.put_nowait(job)
+        self.jobs[job_id] = job
+        job.publicar({"evento": "fila", "posicao": self.fila.qsize()})
+        return job, False
+
+    def _finalizar(self, job):
+        """
+        Compacta o job e descarta os finalizados mais antigos além de MAX_JOBS_FINALIZADOS
+        """
+        job.dados = None
+        job.compactar()
+        self._finalizados.append(job)
+        while len(self._finalizados) > MAX_JOBS_FINALIZADOS:
+            antigo = self._finalizados.popleft()
+            # um job com erro pode ter sido substituído por uma nova submissão com o mesmo id
+            if self.jobs.get(antigo.id) is antigo:
+                del self.jobs[antigo.id]
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.fila.get()
+            try:
+                job.estado = "executando"
+                job.publicar({"evento": "inicio"})
+
+                def ao_incumbente(evento, job=job):
+                    loop.call_soon_threadsafe(job.publicar, evento)
+
+                resolvedor = self.resolvedores[job.metodo]
+                job.resultado = await loop.run_in_executor(
+                    self._executor, resolvedor, job.dados, job.time_limit, ao_incumbente, job.cancelamento)
+                job.estado = "concluido"
+                job.publicar({"evento": "concluido", "resultado": job.resultado})
+            except asyncio.CancelledError:
+                job.cancelamento.cancelar()
+                job.estado = "erro"
+                job.publicar({"evento": "erro", "mensagem": "serviço encerrado"})
+                raise
+            except Exception as e:
+                job.estado = "erro"
+                job.publicar({"evento": "erro", "mensagem": str(e)})
+            finally:
+                # libera os arrays; o resultado continua disponível para duplicatas
+                self._finalizar(job)
+                self.fila.task_done()
+
+    # ------------------------------------------------------------
+    # servidor
+    # ------------------------------------------------------------
+    async def iniciar(self, host=HOST, porta=PORTA, caminho_unix=None):
+        self._tarefas = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if caminho_unix:
+            self._servidor = await asyncio.start_unix_server(self._atender, path=caminho_unix, limit=LIMITE_LINHA)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, porta, limit=LIMITE_LINHA)
+        return self._servidor
+
+    async def parar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        # interrompe os solves em andamento (model.terminate) antes de derrubar os workers
+        for job in self.jobs.values():
+            if job.estado == "executando":
+                job.cancelamento.cancelar()
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+
+    async def _atender(self, reader, writer):
+        async def enviar(msg):
+            writer.write((json.dumps(msg) + "\n").encode())
+            await writer.drain()
+
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                try:
+                    pedido = json.loads(linha)
+                    op = pedido.get("op")
+                    if op == "submeter":
+                        dados = await asyncio.get_running_loop().run_in_executor(None, dados_do_pedido, pedido)
+                        job, duplicado = self.submeter(dados, pedido.get("metodo", "mip"), pedido.get("time_limit"))
+                        await enviar({"ok": True, "job": job.id, "duplicado": duplicado})
+                    elif op == "acompanhar":
+                        job = self.jobs[pedido["job"]]
+                        async for evento in job.acompanhar(pedido.get("desde", 0)):
+                            await enviar(dict(evento, job=job.id))
+                    elif op == "estado":
+                        job = self.jobs[pedido["job"]]
+                        await enviar({"ok": True, "job": job.id, "estado": job.estado, "eventos": len(job.eventos)})
+                    else:
+                        await enviar({"ok": False, "erro": f"operação desconhecida: {op}"})
+                except asyncio.QueueFull:
+                    await enviar({"ok": False, "erro": "fila cheia"})
+                except KeyError as e:
+                    await enviar({"ok": False, "erro": f"não encontrado: {e}"})
+                except (ValueError, OSError) as e:
+                    await enviar({"ok": False, "erro": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class ClienteServico:
+    """
+    Cliente mínimo do protocolo (também usado como cliente substituto em testes)
+    """
+
+    def __init__(self, host=HOST, porta=PORTA, caminho_unix=None):
+        self.host = host
+        self.porta = porta
+        self.caminho_unix = caminho_unix
+
+    async def _conectar(self):
+        if self.caminho_unix:
+            return await asyncio.open_unix_connection(self.caminho_unix, limit=LIMITE_LINHA)
+        return await asyncio.open_connection(self.host, self.porta, limit=LIMITE_LINHA)
+
+    async def _pedido(self, msg):
+        reader, writer = await self._conectar()
+        try:
+            writer.write((json.dumps(msg) + "\n").encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+        finally:
+            writer.close()
+
+    async def submeter(self, pasta=None, dados=None, metodo="mip", time_limit=None):
+        msg = {"op": "submeter", "metodo": metodo, "time_limit": time_limit}
+        if pasta is not None:
+            msg["pasta"] = pasta
+        else:
+            msg["dados"] = {chave: np.asarray(dados[chave]).tolist() for chave in ("c", "t", "S", "f", "o")}
+        return await self._pedido(msg)
+
+    async def estado(self, job_id):
+        return await self._pedido({"op": "estado", "job": job_id})
+
+    async def acompanhar(self, job_id, desde=0):
+        reader, writer = await self._conectar()
+        try:
+            writer.write((json.dumps({"op": "acompanhar", "job": job_id, "desde": desde}) + "\n").encode())
+            await writer.drain()
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    return
+                evento = json.loads(linha)
+                yield evento
+                if evento.get("evento") in ("concluido", "erro") or evento.get("ok") is False:
+                    return
+        finally:
+            writer.close()
+
+
+def _substituto_rapido(dados, time_limit, ao_incumbente, cancelamento):
+    for k, objetivo in enumerate((10.0, 20.0, 30.0)):
+        ao_incumbente({"evento": "incumbente", "objetivo": objetivo, "limitante": 40.0,
+                       "gap": (40.0 - objetivo) / objetivo, "tempo": float(k), "arcos": {0: [[0, 1], [1, 0]]}})
+    return {"status": None, "objective": 30.0, "used_presses": [0], "routes": []}
+
+
+def _substituto_lento(dados, time_limit, ao_incumbente, cancelamento):
+    limite = time.monotonic() + 30
+    while not cancelamento.cancelado and time.monotonic() < limite:
+        time.sleep(0.01)
+    return {"status": None, "objective": None, "used_presses": [], "routes": [], "cancelado": cancelamento.cancelado}
+
+
+async def autoteste():
+    """
+    Exercita o protocolo com ClienteServico e resolvedores substitutos (sem Gurobi)
+    """
+    dados = {"c": np.zeros((1, 2, 2)), "t": np.zeros((1, 2)), "S": np.ones(2), "f": np.zeros(1), "o": np.zeros(1)}
+    pasta = tempfile.mkdtemp()
+    caminho = os.path.join(pasta, "servico.sock")
+    servico = ServicoResolucao(workers=1, resolvedores={"rapido": _substituto_rapido, "lento": _substituto_lento})
+    await servico.iniciar(caminho_unix=caminho)
+    cliente = ClienteServico(caminho_unix=caminho)
+    try:
+        r = await cliente.submeter(dados=dados, metodo="rapido")
+        assert r["ok"] and not r["duplicado"], r
+        eventos = [e async for e in cliente.acompanhar(r["job"])]
+        objetivos = [e["objetivo"] for e in eventos if e.get("evento") == "incumbente"]
+        assert objetivos == [10.0, 20.0, 30.0], eventos
+        assert eventos[-1]["evento"] == "concluido" and eventos[-1]["resultado"]["objective"] == 30.0
+
+        r2 = await cliente.submeter(dados=dados, metodo="rapido")
+        assert r2["ok"] and r2["duplicado"] and r2["job"] == r["job"], r2
+        assert all("arcos" not in e for e in servico.jobs[r["job"]].eventos)
+
+        r3 = await cliente.submeter(dados=dados, metodo="inexistente")
+        assert not r3["ok"], r3
+
+        # parar() precisa interromper o resolvedor em execução
+        lento = await cliente.submeter(dados=dados, metodo="lento")
+        job = servico.jobs[lento["job"]]
+        while job.estado != "executando":
+            await asyncio.sleep(0.01)
+    finally:
+        inicio = time.monotonic()
+        await servico.parar()
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        os.rmdir(pasta)
+    assert job.cancelamento.cancelado and job.estado == "erro"
+    assert time.monotonic() - inicio < 5
+    print("autoteste do serviço: ok")
+    return 0
+
+
+async def _servir(args):
+    servico = ServicoResolucao(workers=args.workers, max_fila=args.max_fila)
+    servidor = await servico.iniciar(args.host, args.porta, args.unix)
+    endereco = args.unix or f"{args.host}:{args.porta}"
+    print(f"Serviço de resolução ouvindo em {endereco} ({args.workers} worker(s), fila {args.max_fila})")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+async def _enviar(args):
+    cliente = ClienteServico(args.host, args.porta, args.unix)
+    resposta = await cliente.submeter(pasta=args.enviar, metodo=args.metodo, time_limit=args.time_limit)
+    print(resposta)
+    if not resposta.get("ok"):
+        return 1
+    async for evento in cliente.acompanhar(resposta["job"]):
+        if evento.get("evento") == "concluido":
+            resultado = evento["resultado"]
+            print(f"concluido: objetivo={resultado['objective']} prensas={resultado['used_presses']}")
+        elif evento.get("evento") in ("incumbente", "progresso"):
+            gap = evento.get("gap")
+            gap_txt = f"{gap * 100:.2f}%" if gap is not None else "-"
+            print(f"{evento['evento']:>10}: objetivo={evento['objetivo']} gap={gap_txt} t={evento['tempo']:.1f}s")
+        else:
+            print(evento)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço local assíncrono de resolução do VRP")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--porta", type=int, default=PORTA)
+    parser.add_argument("--unix", default=None, help="caminho do socket Unix (em vez de TCP)")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--max-fila", type=int, default=MAX_FILA)
+    parser.add_argument("--enviar", default=None, metavar="PASTA", help="modo cliente: envia a pasta e acompanha o job")
+    parser.add_argument("--metodo", default="mip", choices=sorted(RESOLVEDORES))
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--autoteste", action="store_true", help="testa o protocolo com resolvedores substitutos")
+    args = parser.parse_args()
+
+    if args.autoteste:
+        return asyncio.run(autoteste())
+
+    if args.enviar:
+        return asyncio.run(_enviar(args))
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+"""
+Ajuste de parâmetros do Gurobi por classe de tamanho (m prensas, n cidades)
+
+Para cada classe, gera instâncias representativas com files.gerar_instancia,
+mede o esforço até atingir o gap alvo com os parâmetros padrão e procura um
+conjunto melhor (busca coordenada em MIPFocus, Cuts, Heuristics, Presolve e
+Threads, ou a ferramenta de tuning do próprio Gurobi com --gurobi-tune).
+
+O esforço é medido pelo atributo Work do Gurobi (unidades de trabalho
+determinísticas, ~1 s cada), não pelo Runtime: em instâncias pequenas o
+tempo de relógio é dominado por ruído. O antes/depois é reportado em
+instâncias de validação com sementes que a busca não viu.
+
+O melhor conjunto é salvo em tuned_params.json e aplicado automaticamente
+por alg.py quando uma instância da mesma classe é resolvida.
+
+Uso:
+    python tuning.py --classes 5x49 10x54 --instancias 2 --validacao 2 --limite 120
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import alg
+import preprocessamento
+from files import gerar_instancia
+
+# -------- CONFIG ----------
+INSTANCIAS_POR_CLASSE = 3
+INSTANCIAS_VALIDACAO = 3
+LIMITE_POR_EXECUCAO = 120   # unidades de trabalho (WorkLimit) por resolução durante o ajuste
+SEMENTE_BASE = 1000         # instâncias de ajuste != instância padrão (seed 42)
+SEMENTE_VALIDACAO = 2000    # instâncias de validação, fora da busca
+MELHORIA_MINIMA = 0.05      # só troca de configuração se reduzir o trabalho em 5%
+
+# grade de busca (o primeiro valor de cada lista é o padrão do Gurobi)
+GRADE = {
+    "MIPFocus": [0, 1, 2, 3],
+    "Cuts": [-1, 0, 1, 2],
+    "Heuristics": [0.05, 0.2, 0.5],
+    "Presolve": [-1, 0, 1, 2],
+    "Threads": [0, 1, 4],
+}
+# --------------------------
+
+
+def chave_classe(m, n):
+    return f"{m}x{n}"
+
+
+def ler_classe(texto):
+    """
+    Converte '10x54' em (10, 54)
+    """
+    m, n = texto.lower().split("x")
+    return int(m), int(n)
+
+
+def reduzir(dados):
+    """
+    Redução que alg.resolver usaria (None sem alg.PREPROCESS); calculada uma vez por instância
+    """
+    return preprocessamento.preprocessar(dados) if alg.PREPROCESS else None
+
+
+def esforco_ate_gap(dados, reducao, params, alvo_gap, limite):
+    """
+    Resolve a instância com os parâmetros dados e retorna (trabalho, tempo) até o gap alvo.
+    Execuções que não atingem o alvo recebem penalidade de 2x o limite nos dois valores.
+    """
+    model, _ = alg.construir_modelo(dados, reducao=reducao)
+    model.setParam("OutputFlag", 0)
+    alg.configurar_solver(model, *dados["t"].shape, time_limit=None, mip_gap=alvo_gap, usar_ajuste=False)
+    model.setParam("WorkLimit", limite)
+    for nome, valor in params.items():
+        model.setParam(nome, valor)
+    model.optimize()
+
+    atingiu = model.SolCount > 0 and model.MIPGap <= alvo_gap
+    if atingiu:
+        resultado = (model.Work, model.Runtime)
+    else:
+        resultado = (2 * limite, 2 * model.Runtime)
+    model.dispose()
+    return resultado
+
+
+def avaliar(instancias, reducoes, params, alvo_gap, limite):
+    """
+    Trabalho e tempo médios até o gap alvo sobre todas as instâncias
+    """
+    medidas = [esforco_ate_gap(dados, reducao, params, alvo_gap, limite)
+               for dados, reducao in zip(instancias, reducoes)]
+    trabalho = sum(w for w, _ in medidas) / len(medidas)
+    tempo = sum(t for _, t in medidas) / len(medidas)
+    return trabalho, tempo
+
+
+def busca_coordenada(instancias, reducoes, alvo_gap, limite, trabalho_base):
+    """
+    Varia um parâmetro de cada vez, mantendo a melhor configuração encontrada
+    """
+    melhor, melhor_trabalho = {}, trabalho_base
+    for nome, valores in GRADE.items():
+        for valor in valores[1:]:
+            candidato = dict(melhor, **{nome: valor})
+            trabalho, tempo = avaliar(instancias, reducoes, candidato, alvo_gap, limite)
+            print(f"  {candidato} -> {trabalho:.4f} unid. ({tempo:.2f}s)")
+            if trabalho < melhor_trabalho * (1 - MELHORIA_MINIMA):
+                melhor, melhor_trabalho = candidato, trabalho
+    return melhor, melhor_trabalho
+
+
+def tuning_gurobi(instancias, reducoes, alvo_gap, limite):
+    """
+    Usa a ferramenta de tuning do Gurobi na primeira instância e lê os
+    parâmetros alterados do arquivo .prm resultante
+    """
+    model, _ = alg.construir_modelo(instancias[0], reducao=reducoes[0])
+    model.setParam("OutputFlag", 0)
+    alg.configurar_solver(model, *instancias[0]["t"].shape, time_limit=None, mip_gap=alvo_gap, usar_ajuste=False)
+    model.setParam("WorkLimit", limite)
+    model.setParam("TuneTimeLimit", limite * len(GRADE))
+    model.setParam("TuneResults", 1)
+    model.tune()
+
+    params = {}
+    if model.TuneResultCount > 0:
+        model.getTuneResult(0)
+        fd, caminho = tempfile.mkstemp(suffix=".prm")
+        os.close(fd)
+        try:
+            model.write(caminho)
+            with open(caminho, "r") as fp:
+                for linha in fp:
+                    partes = linha.split()
+                    if len(partes) != 2 or linha.startswith("#"):
+                        continue
+                    nome, valor = partes
+                    # TimeLimit/MIPGap continuam vindo de alg.py
+                    if nome in ("TimeLimit", "WorkLimit", "MIPGap"):
+                        continue
+                    params[nome] = float(valor) if "." in valor or "e" in valor.lower() else int(valor)
+        finally:
+            os.remove(caminho)
+    model.dispose()
+    return params
+
+
+def salvar_resultado(m, n, entrada, caminho=alg.TUNED_PARAMS_FILE):
+    """
+    Atualiza o cache de parâmetros ajustados (escrita atômica)
+    """
+    cache = {}
+    if os.path.exists(caminho):
+        with open(caminho, "r") as fp:
+            cache = json.load(fp)
+    cache[chave_classe(m, n)] = entrada
+
+    tmp = caminho + ".tmp"
+    with open(tmp, "w") as fp:
+        json.dump(cache, fp, indent=2)
+    os.replace(tmp, caminho)
+
+
+def ajustar_classe(m, n, num_instancias=INSTANCIAS_POR_CLASSE, limite=LIMITE_POR_EXECUCAO,
+                   alvo_gap=alg.MIP_GAP, usar_gurobi_tune=False, num_validacao=INSTANCIAS_VALIDACAO):
+    """
+    Ajusta os parâmetros de uma classe (m, n), mede antes/depois nas instâncias
+    de validação e salva o resultado no cache
+    """
+    print("=" * 60)
+    print(f"Classe {chave_classe(m, n)}: {num_instancias} instância(s) de ajuste, "
+          f"{num_validacao} de validação, gap alvo {alvo_gap:g}")
+    print("=" * 60)
+
+    instancias = [gerar_instancia(m, n, seed=SEMENTE_BASE + s) for s in range(num_instancias)]
+    reducoes = [reduzir(dados) for dados in instancias]
+
+    trabalho_base, tempo_base = avaliar(instancias, reducoes, {}, alvo_gap, limite)
+    print(f"Parâmetros padrão: {trabalho_base:.4f} unid. ({tempo_base:.2f}s)")
+
+    if usar_gurobi_tune:
+        params = tuning_gurobi(instancias, reducoes, alvo_gap, limite)
+        trabalho_ajustado, tempo_ajustado = avaliar(instancias, reducoes, params, alvo_gap, limite)
+        print(f"  {params} -> {trabalho_ajustado:.4f} unid. ({tempo_ajustado:.2f}s)")
+        if not params or trabalho_ajustado >= trabalho_base * (1 - MELHORIA_MINIMA):
+            params = {}
+    else:
+        params, _ = busca_coordenada(instancias, reducoes, alvo_gap, limite, trabalho_base)
+
+    # antes/depois em instâncias que a busca não viu
+    validacao = [gerar_instancia(m, n, seed=SEMENTE_VALIDACAO + s) for s in range(num_validacao)]
+    reducoes_validacao = [reduzir(dados) for dados in validacao]
+    antes = avaliar(validacao, reducoes_validacao, {}, alvo_gap, limite)
+    depois = avaliar(validacao, reducoes_validacao, params, alvo_gap, limite) if params else antes
+    print(f"Validação: padrão {antes[0]:.4f} unid. ({antes[1]:.2f}s) -> "
+          f"ajustado {depois[0]:.4f} unid. ({depois[1]:.2f}s)")
+
+    entrada = {
+        "m": m,
+        "n": n,
+        "params": params,
+        "alvo_gap": alvo_gap,
+        "instancias": num_instancias,
+        "instancias_validacao": num_validacao,
+        "limite_trabalho": limite,
+        "metodo": "gurobi_tune" if usar_gurobi_tune else "busca_coordenada",
+        "trabalho_base": antes[0],
+        "trabalho_ajustado": depois[0],
+        "tempo_base": antes[1],
+        "tempo_ajustado": depois[1],
+        "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    salvar_resultado(m, n, entrada)
+    return entrada
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste de parâmetros do Gurobi por classe (m, n)")
+    parser.add_argument("--classes", nargs="+", default=["10x50"], help="classes no formato MxN")
+    parser.add_argument("--instancias", type=int, default=INSTANCIAS_POR_CLASSE, help="instâncias usadas na busca")
+    parser.add_argument("--validacao", type=int, default=INSTANCIAS_VALIDACAO,
+                        help="instâncias (sementes fora da busca) para medir antes/depois")
+    parser.add_argument("--limite", type=float, default=LIMITE_POR_EXECUCAO,
+                        help="unidades de trabalho do Gurobi (WorkLimit) por resolução")
+    parser.add_argument("--gap", type=float, default=alg.MIP_GAP, help="gap alvo")
+    parser.add_argument("--gurobi-tune", action="store_true", help="usa model.tune() em vez da busca própria")
+    args = parser.parse_args()
+
+    resultados = []
+    for texto in args.classes:
+        m, n = ler_classe(texto)
+        resultados.append(ajustar_classe(m, n, args.instancias, args.limite, args.gap, args.gurobi_tune,
+                                         args.validacao))
+
+    print("\n" + "=" * 60)
+    print("ESFORÇO ATÉ O GAP ALVO NA VALIDAÇÃO (média por classe)")
+    print("=" * 60)
+    print(f"{'classe':>10} {'antes (unid.)':>14} {'depois (unid.)':>15} {'antes (s)':>10} {'depois (s)':>11} {'speedup':>9}")
+    for r in resultados:
+        speedup = r["trabalho_base"] / r["trabalho_ajustado"] if r["trabalho_ajustado"] > 0 else float("inf")
+        print(f"{chave_classe(r['m'], r['n']):>10} {r['trabalho_base']:>14.4f} {r['trabalho_ajustado']:>15.4f} "
+              f"{r['tempo_base']:>10.2f} {r['tempo_ajustado']:>11.2f} {speedup:>8.2f}x")
+        print(f"{'':>10} params: {r['params']}")
+    print(f"\nParâmetros salvos em {alg.TUNED_PARAMS_FILE}")
+
+
+if __name__ == "__main__":
+    main()